@@ -7,6 +7,31 @@
 #
 #     https://opensource.org/licenses/MIT
 
-from .agent import root_agent
+import importlib
+import os
+import sys
 
-__all__ = ["root_agent"]
\ No newline at end of file
+# rest_api imports agent.py as the top-level `agent` module, the ADK loader
+# through this package. Register one module under both names, so the root
+# agent and its services are built once per process whichever comes first.
+# A top-level `agent` is only reused when it is this directory's agent.py,
+# and neither name is aliased until the module has loaded.
+_AGENT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "agent.py")
+_AGENT_MODULE_NAME = f"{__name__}.agent"
+_agent_module = sys.modules.get("agent")
+if _agent_module is None or os.path.abspath(getattr(_agent_module, "__file__", "") or "") != _AGENT_FILE:
+    _agent_module = None
+try:
+    if _agent_module is None:
+        _agent_module = importlib.import_module(_AGENT_MODULE_NAME)
+    root_agent = _agent_module.root_agent
+except BaseException:
+    # Leave no name pointing at a module that failed to load
+    for _name in ("agent", _AGENT_MODULE_NAME):
+        if _agent_module is not None and sys.modules.get(_name) is _agent_module:
+            del sys.modules[_name]
+    raise
+sys.modules[_AGENT_MODULE_NAME] = agent = _agent_module
+sys.modules.setdefault("agent", _agent_module)
+
+__all__ = ["root_agent"]
@@ -15,43 +15,129 @@ natural language understanding. The agent is designed to handle note-taking,
 organization, and retrieval tasks.
 """
 # Standard library imports
+import copy
+import json
 import logging
+import os
+from collections import OrderedDict
 import litellm
 import asyncio
 
-# Monkey-patch litellm to handle Ollama's message format
-_original_acompletion = litellm.acompletion
+# Monkey-patch litellm to handle Ollama's message format.
+# The package __init__ registers this module under both `agent` and
+# `AutoYou_Agents.agent`, but it can still be executed again on reload, so
+# always wrap the unpatched function rather than a previously installed patch.
+_original_acompletion = getattr(litellm.acompletion, "_autoyou_original", litellm.acompletion)
+
+# Opt-in exact-match cache for deterministic, tool-free completions
+# (set LLM_RESPONSE_CACHE_SIZE to a positive size to enable it)
+_RESPONSE_CACHE_SIZE = int(os.getenv("LLM_RESPONSE_CACHE_SIZE", "0"))
+_response_cache = OrderedDict()
 
 def _flatten_message_content(messages):
     """
     Flattens the 'content' of messages if it is a list of parts,
     which is how ADK represents complex content, into a single string
     that Ollama expects.
+
+    Messages whose content is already a string are left untouched. Exact
+    type checks and a list comprehension keep this cheap, since it runs on
+    every LLM call.
     """
     for message in messages:
-        if isinstance(message.get("content"), list):
-            new_content = " ".join(
+        content = message.get("content")
+        if content.__class__ is list:
+            message["content"] = " ".join([
                 part["text"]
-                for part in message["content"]
-                if isinstance(part, dict) and "text" in part
-            )
-            message["content"] = new_content
+                for part in content
+                if part.__class__ is dict and "text" in part
+            ])
     return messages
 
+def _response_cache_key(args, kwargs):
+    """
+    Build a cache key from the completion arguments (model, messages,
+    temperature, ...). Returns None if they are not plain JSON values,
+    since a str() fallback could embed object addresses and never match.
+    """
+    try:
+        return json.dumps([args, kwargs], sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
 async def _patched_acompletion(*args, **kwargs):
     """
     Patched version of litellm.acompletion that flattens message content
     before passing it to the original function.
+
+    The messages are only rewritten when at least one of them still carries
+    list content; already-flat histories are passed through as-is.
+    When the response cache is enabled, non-streaming requests without
+    tools and with temperature 0 are served from an LRU cache if the exact
+    same request was seen before. Sampled requests (temperature unset or
+    above 0) and tool-calling requests always reach the model.
     """
-    if "messages" in kwargs:
-        kwargs["messages"] = _flatten_message_content(kwargs["messages"])
-    return await _original_acompletion(*args, **kwargs)
+    messages = kwargs.get("messages")
+    if messages is not None:
+        for message in messages:
+            if message.get("content").__class__ is list:
+                _flatten_message_content(messages)
+                break
+
+    if (_RESPONSE_CACHE_SIZE <= 0 or kwargs.get("stream") or kwargs.get("tools")
+            or kwargs.get("temperature") is None or kwargs["temperature"] > 0):
+        return await _original_acompletion(*args, **kwargs)
+
+    key = _response_cache_key(args, kwargs)
+    if key is None:
+        return await _original_acompletion(*args, **kwargs)
+    if key in _response_cache:
+        _response_cache.move_to_end(key)
+        # Callers may mutate the response; hand each one its own copy
+        return copy.deepcopy(_response_cache[key])
 
+    response = await _original_acompletion(*args, **kwargs)
+    _response_cache[key] = copy.deepcopy(response)
+    if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+    return response
+
+_patched_acompletion._autoyou_original = _original_acompletion
 litellm.acompletion = _patched_acompletion
 
 
 # Third-party imports
 from google.adk.agents import Agent
+from google.adk.models import lite_llm as _adk_lite_llm
+
+# Serialize tool responses sent through LiteLLM with orjson when it is installed.
+# Tool payloads from the notes agent are plain dicts/lists/strings, which orjson
+# encodes several times faster than the stdlib json used by ADK. This replaces a
+# private ADK helper, so it is skipped (and logged) if ADK no longer has it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None and callable(getattr(_adk_lite_llm, "_safe_json_serialize", None)):
+    _adk_json_serialize = getattr(
+        _adk_lite_llm._safe_json_serialize, "_autoyou_original", _adk_lite_llm._safe_json_serialize
+    )
+
+    def _orjson_serialize(obj) -> str:
+        """Serialize with orjson, falling back to ADK's serializer for unsupported types."""
+        try:
+            return orjson.dumps(obj).decode()
+        except TypeError:
+            return _adk_json_serialize(obj)
+
+    _orjson_serialize._autoyou_original = _adk_json_serialize
+    _adk_lite_llm._safe_json_serialize = _orjson_serialize
+elif orjson is not None:
+    logging.getLogger(__name__).warning(
+        "google.adk.models.lite_llm._safe_json_serialize not found; "
+        "tool responses use ADK's own JSON serialization"
+    )
 
 # Local imports
 from ollama_service import OllamaService
@@ -63,7 +149,6 @@ from prompt import AGENT_NAME, AGENT_DESCRIPTION, AGENT_INSTRUCTION
 # litellm._turn_on_debug()
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize services
@@ -87,4 +172,6 @@ try:
 
 except Exception as e:
     logger.error("Failed to initialize agent: %s", str(e))
-    logger.error("Please check your model configuration, availability of OLLAMA if locally running, or check GOOGLE API keys.")
\ No newline at end of file
+    logger.error("Please check your model configuration, availability of OLLAMA if locally running, or check GOOGLE API keys.")
+    # Keep the module importable; callers check for None instead of hitting NameError
+    root_agent = None
\ No newline at end of file
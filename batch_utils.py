@@ -0,0 +1,53 @@
+# Copyright (c) 2025 AutoYou
+#
+# Licensed under the MIT License
+#
+# This software is released under the MIT License.
+# You may obtain a copy of the License at
+#
+#     https://opensource.org/licenses/MIT
+
+"""
+Batching utilities for AutoYou AI Agent.
+
+This module provides helpers for issuing several independent LLM
+completions concurrently instead of awaiting them one after another.
+Ollama serves parallel requests up to its OLLAMA_NUM_PARALLEL setting.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import litellm
+
+logger = logging.getLogger(__name__)
+
+
+async def abatch_completions(messages_list: List[List[Dict[str, Any]]],
+                             max_concurrency: Optional[int] = None,
+                             **kwargs) -> List[Any]:
+    """
+    Run one completion per message list concurrently and return the results in order.
+
+    Args:
+        messages_list: A list of chat message lists, one per completion
+        max_concurrency: Optional cap on in-flight requests (e.g. OLLAMA_NUM_PARALLEL)
+        **kwargs: Arguments passed to every litellm.acompletion call (model, api_base, ...)
+
+    Returns:
+        The completion responses, in the same order as messages_list
+    """
+    if not messages_list:
+        return []
+
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def _complete(messages):
+        # Resolve litellm.acompletion at call time so the message patch in agent.py applies
+        if semaphore is None:
+            return await litellm.acompletion(messages=messages, **kwargs)
+        async with semaphore:
+            return await litellm.acompletion(messages=messages, **kwargs)
+
+    logger.info("Dispatching %d completions concurrently", len(messages_list))
+    return await asyncio.gather(*(_complete(messages) for messages in messages_list))
@@ -15,16 +15,29 @@ based on availability and environment configuration.
 """
 import os
 import logging
+from functools import lru_cache
 from google.adk.models.lite_llm import LiteLlm
 from ollama_service import OllamaService
 
 logger = logging.getLogger(__name__)
 BASE_OLLAMA_PROVIDER = "ollama_chat/"
+_TRUTHY = frozenset({'1', 'true', 'yes', 'on'})
 
+# Model settings are read once at import; server.py applies its defaults before this module loads
+_USE_GOOGLE_API = os.getenv('USE_GOOGLE_API', '0').lower() in _TRUTHY
+_OLLAMA_API_BASE = os.getenv('OLLAMA_API_BASE', 'http://localhost:11434')
+_OLLAMA_MODEL = os.getenv('OLLAMA_MODEL', 'qwen3:4b')
+_GOOGLE_MODEL = os.getenv('GOOGLE_MODEL', 'gemini-2.5-flash')
+
+@lru_cache(maxsize=8)
 def get_model_config(ollama_service: OllamaService):
     """
     Determine the best available model configuration.
 
+    The result is memoized per service, so building several agents reuses
+    one configuration instead of probing Ollama again. Call
+    get_model_config.cache_clear() to force a new selection.
+
     Args:
         ollama_service: Instance of OllamaService for checking Ollama availability
 
@@ -35,9 +48,7 @@ def get_model_config(ollama_service: OllamaService):
         ValueError: If no valid API key is found for Gemini model
     """
     # Check if we should use Google API based on environment variable
-    use_google_api = os.getenv('USE_GOOGLE_API', '0').lower() in ('1', 'true', 'yes')
-
-    if use_google_api:
+    if _USE_GOOGLE_API:
         logger.info("USE_GOOGLE_API is enabled, using Gemini model directly")
         return _configure_gemini_model()
 
@@ -63,10 +74,9 @@ def _configure_gemini_model():
             "GEMINI_API_KEY environment variable."
         )
 
-    model_name = os.getenv('GOOGLE_MODEL', 'gemini-2.5-flash')
-    logger.info("Using Gemini model: %s", model_name)
+    logger.info("Using Gemini model: %s", _GOOGLE_MODEL)
 
-    return LiteLlm(model=model_name)
+    return LiteLlm(model=_GOOGLE_MODEL)
 
 
 def _configure_ollama_model(ollama_service: OllamaService):
@@ -76,7 +86,7 @@ def _configure_ollama_model(ollama_service: OllamaService):
         raise ConnectionError("Ollama service is not available")
 
     # Get the configured model name
-    model_name = os.getenv('OLLAMA_MODEL', 'qwen3:4b')
+    model_name = _OLLAMA_MODEL
     logger.info("Attempting to use Ollama model: %s", model_name)
 
     # Get list of available models
@@ -94,12 +104,17 @@ def _configure_ollama_model(ollama_service: OllamaService):
         raise RuntimeError("No suitable Ollama model found")
 
     logger.info("Using Ollama model: %s", selected_model)
+    # These are read by the Ollama server; concurrent requests (see batch_utils) scale up to them
+    logger.info(
+        "Ollama concurrency settings: OLLAMA_NUM_PARALLEL=%s, OLLAMA_MAX_LOADED_MODELS=%s",
+        os.getenv('OLLAMA_NUM_PARALLEL', 'server default'),
+        os.getenv('OLLAMA_MAX_LOADED_MODELS', 'server default')
+    )
 
     # Configure LiteLlm with Ollama
-    api_base = os.getenv('OLLAMA_API_BASE', 'http://localhost:11434')
     return LiteLlm(
-        model=BASE_OLLAMA_PROVIDER + selected_model,
-        api_base=api_base
+        model=f"{BASE_OLLAMA_PROVIDER}{selected_model}",
+        api_base=_OLLAMA_API_BASE
     )
 
 
@@ -8,20 +8,43 @@
 #     https://opensource.org/licenses/MIT
 
 from google.adk.agents import Agent
+from google.adk.tools import FunctionTool
 
-from .notes_tool import NotesTool
+from .notes_tool import NotesTool, NotesError
 from .prompt import AGENT_NAME, AGENT_DESCRIPTION, AGENT_INSTRUCTION
+from functools import cache
 from typing import Optional, List
+import asyncio
 import logging
+import sqlite3
+import threading
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize notes tool with database in the current directory where source code is
-notes_tool = NotesTool()
+# Serializes the first _get_notes_tool() call, which worker threads may race on
+_notes_tool_lock = threading.Lock()
 
-def create_note(title: str, content: str, tags: Optional[List[str]] = None, category: Optional[str] = None) -> dict:
+@cache
+def _get_notes_tool() -> NotesTool:
+    """Create the notes tool on first use, with its database in the directory where source code is."""
+    return NotesTool()
+
+def _call_notes_tool(method_name: str, *args, **kwargs):
+    """Call a NotesTool method, creating the tool on first use."""
+    with _notes_tool_lock:
+        tool = _get_notes_tool()
+    return getattr(tool, method_name)(*args, **kwargs)
+
+async def _run_notes_tool(method_name: str, *args, **kwargs):
+    """Run a NotesTool method in a worker thread.
+
+    The tool is resolved in the worker too, so opening the database and
+    running its migrations on first use never block the event loop.
+    """
+    return await asyncio.to_thread(_call_notes_tool, method_name, *args, **kwargs)
+
+async def create_note(title: str, content: str, tags: Optional[List[str]] = None, category: Optional[str] = None) -> dict:
     """Create a new note with the given title, content, tags, and category.
     
     Args:
@@ -34,7 +57,8 @@ def create_note(title: str, content: str, tags: Optional[List[str]] = None, cate
         dict: Result with note_id if successful, or error message
     """
     try:
-        result = notes_tool.create_note(
+        result = await _run_notes_tool(
+            "create_note",
             title=title,
             content=content,
             tags=tags or [],
@@ -51,13 +75,42 @@ def create_note(title: str, content: str, tags: Optional[List[str]] = None, cate
                 "status": "error",
                 "message": result.get('error', 'Unknown error occurred')
             }
-    except Exception as e:
+    except (sqlite3.Error, NotesError, ValueError) as e:
         return {
             "status": "error",
             "message": f"Failed to create note: {str(e)}"
         }
 
-def search_notes(query: str, limit: Optional[int] = 10) -> dict:
+async def bulk_create_notes(notes: List[dict]) -> dict:
+    """Create several notes at once in a single operation.
+    
+    Args:
+        notes: List of notes, each a dict with 'title', 'content', and optional 'tags' (list of strings) and 'category'
+        
+    Returns:
+        dict: Result with the created note IDs if successful, or error message
+    """
+    try:
+        result = await _run_notes_tool("create_notes", notes)
+        if result.get('success'):
+            return {
+                "status": "success",
+                "note_ids": result['note_ids'],
+                "count": len(result['note_ids']),
+                "message": f"Created {len(result['note_ids'])} notes with IDs {result['note_ids']}"
+            }
+        else:
+            return {
+                "status": "error",
+                "message": result.get('error', 'Unknown error occurred')
+            }
+    except (sqlite3.Error, NotesError, ValueError) as e:
+        return {
+            "status": "error",
+            "message": f"Failed to create notes: {str(e)}"
+        }
+
+async def search_notes(query: str, limit: Optional[int] = 10) -> dict:
     """Search for notes containing the given query.
     
     Args:
@@ -68,22 +121,48 @@ def search_notes(query: str, limit: Optional[int] = 10) -> dict:
         dict: Search results with matching notes
     """
     try:
-        results = notes_tool.search_notes(query=query, limit=limit or 10)
+        results = await _run_notes_tool("search_notes", query=query, limit=limit or 10)
+        count = len(results)
         return {
             "status": "success",
             "results": results,
-            "count": len(results),
-            "message": f"Found {len(results)} notes matching '{query}'"
+            "count": count,
+            "message": f"Found {count} notes matching '{query}'"
         }
-    except Exception as e:
+    except (sqlite3.Error, NotesError, ValueError) as e:
         return {
             "status": "error",
             "message": f"Failed to search notes: {str(e)}"
         }
 
-def list_notes(category: Optional[str] = None, limit: Optional[int] = NotesTool.DEFAULT_LIST_LIMIT, 
-               created_after: Optional[str] = None, created_before: Optional[str] = None,
-               created_on: Optional[str] = None) -> dict:
+async def search_notes_by_tag(tag: str, limit: Optional[int] = NotesTool.DEFAULT_LIST_LIMIT) -> dict:
+    """Find notes that have the given tag.
+    
+    Args:
+        tag: The exact tag to look for
+        limit: Maximum number of notes to return (default: NotesTool.DEFAULT_LIST_LIMIT)
+        
+    Returns:
+        dict: Notes with the tag
+    """
+    try:
+        results = await _run_notes_tool("search_by_tag", tag=tag, limit=limit)
+        count = len(results)
+        return {
+            "status": "success",
+            "notes": results,
+            "count": count,
+            "message": f"Found {count} notes tagged '{tag}'"
+        }
+    except (sqlite3.Error, NotesError, ValueError) as e:
+        return {
+            "status": "error",
+            "message": f"Failed to search notes by tag: {str(e)}"
+        }
+
+async def list_notes(category: Optional[str] = None, limit: Optional[int] = NotesTool.DEFAULT_LIST_LIMIT, 
+                     created_after: Optional[str] = None, created_before: Optional[str] = None,
+                     created_on: Optional[str] = None) -> dict:
     """List all notes, optionally filtered by category and/or date.
     
     Args:
@@ -97,7 +176,8 @@ def list_notes(category: Optional[str] = None, limit: Optional[int] = NotesTool.
         dict: List of notes
     """
     try:
-        results = notes_tool.list_notes(
+        results = await _run_notes_tool(
+            "list_notes",
             category=category, 
             limit=limit,
             created_after=created_after,
@@ -105,6 +185,8 @@ def list_notes(category: Optional[str] = None, limit: Optional[int] = NotesTool.
             created_on=created_on
         )
         
+        count = len(results)
+        
         # Build filter description for response
         filter_desc = []
         if category:
@@ -124,16 +206,16 @@ def list_notes(category: Optional[str] = None, limit: Optional[int] = NotesTool.
         return {
             "status": "success",
             "notes": results,
-            "count": len(results),
-            "message": f"Retrieved {len(results)} notes{filter_text}"
+            "count": count,
+            "message": f"Retrieved {count} notes{filter_text}"
         }
-    except Exception as e:
+    except (sqlite3.Error, NotesError, ValueError) as e:
         return {
             "status": "error",
             "message": f"Failed to list notes: {str(e)}"
         }
 
-def get_note(note_id: int) -> dict:
+async def get_note(note_id: int) -> dict:
     """Retrieve a specific note by its ID.
     
     Args:
@@ -143,7 +225,7 @@ def get_note(note_id: int) -> dict:
         dict: The note data if found, or error message
     """
     try:
-        note = notes_tool.get_note(note_id)
+        note = await _run_notes_tool("get_note", note_id)
         if note:
             return {
                 "status": "success",
@@ -155,14 +237,14 @@ def get_note(note_id: int) -> dict:
                 "status": "error",
                 "message": f"Note {note_id} not found"
             }
-    except Exception as e:
+    except (sqlite3.Error, NotesError, ValueError) as e:
         return {
             "status": "error",
             "message": f"Failed to get note: {str(e)}"
         }
 
-def update_note(note_id: int, title: Optional[str] = None, content: Optional[str] = None, 
-                tags: Optional[List[str]] = None, category: Optional[str] = None) -> dict:
+async def update_note(note_id: int, title: Optional[str] = None, content: Optional[str] = None, 
+                      tags: Optional[List[str]] = None, category: Optional[str] = None) -> dict:
     """Update an existing note.
     
     Args:
@@ -176,7 +258,8 @@ def update_note(note_id: int, title: Optional[str] = None, content: Optional[str
         dict: Success or error message
     """
     try:
-        success = notes_tool.update_note(
+        success = await _run_notes_tool(
+            "update_note",
             note_id=note_id,
             title=title,
             content=content,
@@ -193,13 +276,13 @@ def update_note(note_id: int, title: Optional[str] = None, content: Optional[str
                 "status": "error",
                 "message": f"Failed to update note {note_id} - note may not exist"
             }
-    except Exception as e:
+    except (sqlite3.Error, NotesError, ValueError) as e:
         return {
             "status": "error",
             "message": f"Failed to update note: {str(e)}"
         }
 
-def delete_note(note_id: int) -> dict:
+async def delete_note(note_id: int) -> dict:
     """Delete a note by its ID.
     
     Args:
@@ -209,7 +292,7 @@ def delete_note(note_id: int) -> dict:
         dict: Success or error message
     """
     try:
-        success = notes_tool.delete_note(note_id)
+        success = await _run_notes_tool("delete_note", note_id)
         if success:
             return {
                 "status": "success",
@@ -220,12 +303,71 @@ def delete_note(note_id: int) -> dict:
                 "status": "error",
                 "message": f"Failed to delete note {note_id} - note may not exist"
             }
-    except Exception as e:
+    except (sqlite3.Error, NotesError, ValueError) as e:
         return {
             "status": "error",
             "message": f"Failed to delete note: {str(e)}"
         }
 
+async def bulk_delete_notes(note_ids: List[int]) -> dict:
+    """Delete several notes at once by their IDs.
+    
+    Args:
+        note_ids: The IDs of the notes to delete
+        
+    Returns:
+        dict: Number of notes deleted, or error message
+    """
+    try:
+        deleted = await _run_notes_tool("delete_notes", note_ids)
+        if deleted:
+            return {
+                "status": "success",
+                "count": deleted,
+                "message": f"Deleted {deleted} of {len(note_ids)} notes"
+            }
+        else:
+            return {
+                "status": "error",
+                "message": "Failed to delete notes - notes may not exist"
+            }
+    except (sqlite3.Error, NotesError, ValueError) as e:
+        return {
+            "status": "error",
+            "message": f"Failed to delete notes: {str(e)}"
+        }
+
+class _CachedFunctionTool(FunctionTool):
+    """FunctionTool that builds its function declaration once instead of on every model call.
+
+    The declaration is built on first use rather than at import, since it
+    depends on the API variant (GOOGLE_GENAI_USE_VERTEXAI) read from the
+    environment, which server.py and dotenv may set after this module loads.
+    """
+
+    def __init__(self, func):
+        super().__init__(func=func)
+        self._declaration = None
+
+    def _get_declaration(self):
+        if self._declaration is None:
+            self._declaration = super()._get_declaration()
+        return self._declaration
+
+# Wrap the tools once at import; ADK would otherwise build a new FunctionTool
+# (and re-derive its schema from the signature and docstring) on each model call
+_NOTES_TOOLS = tuple(_CachedFunctionTool(tool) for tool in (
+    create_note,
+    bulk_create_notes,
+    search_notes,
+    search_notes_by_tag,
+    list_notes,
+    get_note,
+    update_note,
+    delete_note,
+    bulk_delete_notes
+))
+
 def create_notes_agent(model_config):
     """Create a notes agent with the provided model configuration.
     
@@ -240,12 +382,5 @@ def create_notes_agent(model_config):
         model=model_config,
         description=AGENT_DESCRIPTION,
         instruction=AGENT_INSTRUCTION,
-        tools=[
-            create_note,
-            search_notes,
-            list_notes,
-            get_note,
-            update_note,
-            delete_note
-        ]
+        tools=list(_NOTES_TOOLS)
     )
@@ -11,13 +11,39 @@ import sqlite3
 import json
 import logging
 import os
+import queue
 import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import combinations
+from pathlib import Path
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from google.adk.tools import FunctionTool
 
 logger = logging.getLogger(__name__)
 
+# Tags are stored as JSON text for the full-text index. Use orjson when it is
+# installed; the stdlib fallback produces the same compact UTF-8 output.
+try:
+    import orjson
+
+    def _dump_json(value) -> str:
+        return orjson.dumps(value).decode()
+except ImportError:
+    def _dump_json(value) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+# Note timestamps are local time, like the date filters and the times shown
+# to the user. SQLite formats them ('YYYY-MM-DD HH:MM:SS.SSS'), so every row
+# of one statement gets the same value and all rows sort alike.
+_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+class NotesError(Exception):
+    """Raised when the notes database cannot be set up or used."""
+
 class NotesTool:
     """Native note-taking tool for AutoYou agent with SQLite storage."""
     
@@ -27,8 +53,18 @@ class NotesTool:
     MAX_CATEGORY_LENGTH = 1000
     MAX_TAG_LENGTH = 1000
     MAX_TAGS_COUNT = 1000
+    MAX_BULK_NOTES = 1000
+    INSERT_CHUNK_ROWS = 199  # Rows per multi-row INSERT; 5 columns stay under the 999 bound variable limit
     SEARCH_LIMIT_MAX = 1000
     DB_TIMEOUT = 30.0
+    DB_CACHE_SIZE_KIB = 65536  # Page cache size; keeps the FTS index in memory
+    DB_MMAP_SIZE = 268435456  # 256 MiB of memory-mapped reads
+    DB_WAL_AUTOCHECKPOINT = 1000  # Pages of WAL before an automatic checkpoint
+    OPTIMIZE_INTERVAL = 900.0  # Seconds between PRAGMA optimize / FTS merge runs
+    FTS_MERGE_PAGES = 500  # Upper bound on index pages written by one FTS merge step
+    READER_POOL_SIZE = 4  # Read-only connections serving get/list/search
+    DB_CACHED_STATEMENTS = 256  # Compiled statements kept per connection
+    RESULT_CACHE_SIZE = 256  # Cached search/list results (0 disables the cache)
     
     # Query and display limits
     MAX_QUERY_LENGTH = 1000
@@ -36,11 +72,298 @@ class NotesTool:
     DEFAULT_LIST_LIMIT = 200
     CONTENT_TRUNCATE_LENGTH = 200
     
+    SCHEMA_VERSION = 2  # Stored in PRAGMA user_version once migrations are applied
+    
+    # Date filter keywords, each resolved relative to today's local date
+    _KEYWORD_DATES = {
+        'today': lambda today: today,
+        'now': lambda today: today,
+        'yesterday': lambda today: today - timedelta(days=1),
+        'this week': lambda today: today - timedelta(days=today.weekday()),  # Monday
+        'week': lambda today: today - timedelta(days=today.weekday()),
+        'this month': lambda today: today.replace(day=1),
+        'month': lambda today: today.replace(day=1),
+    }
+    # MM/DD/YYYY (or DD/MM/YYYY) and YYYY/MM/DD
+    _SLASH_DATE = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})|(\d{4})/(\d{1,2})/(\d{1,2})')
+    # YYYY-M-D without zero padding, which fromisoformat rejects
+    _DASH_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+    
     ALLOWED_COLUMNS = {'title', 'content', 'tags', 'category'}  # Whitelist for dynamic queries
+    TAG_SEPARATOR = '\x1f'  # ASCII unit separator joining tags read back from note_tags
+    
+    # Full-text index over notes. Porter stemming on top of unicode61 lets a
+    # search for "meeting" also match "meetings", and remove_diacritics makes
+    # "cafe" match "café". Prefix indexes of 2-4 characters serve prefix
+    # searches such as "mee*" without scanning the vocabulary. When this
+    # definition changes, the index is recreated and rebuilt from the notes
+    # table on startup.
+    _FTS_TABLE_SQL = """
+        CREATE VIRTUAL TABLE notes_search USING fts5(
+            title, content, tags, category, content='notes', content_rowid='id',
+            prefix='2 3 4', tokenize='porter unicode61 remove_diacritics 2'
+        )
+    """
+    # bm25 column weights (title, content, tags, category): title and tag
+    # matches rank above matches in the body
+    _FTS_RANK = "bm25(10.0, 1.0, 5.0, 2.0)"
+    
+    # Reindex a note only when an indexed column is written. Archiving and other
+    # updates that touch only archived/updated_at skip re-tokenizing the content.
+    _FTS_UPDATE_TRIGGER_SQL = """
+        CREATE TRIGGER notes_au AFTER UPDATE OF title, content, tags, category ON notes BEGIN
+            INSERT INTO notes_search(notes_search, rowid, title, content, tags, category)
+            VALUES('delete', old.id, old.title, old.content, old.tags, old.category);
+            INSERT INTO notes_search(rowid, title, content, tags, category)
+            VALUES (new.id, new.title, new.content, new.tags, new.category);
+        END
+    """
+    
+    # Fixed SQL statements. Sending the same text on every call lets sqlite3's
+    # per-connection statement cache reuse the compiled statement.
+    _INSERT_NOTE_SQL = f"""
+        INSERT INTO notes (title, content, tags, category, content_preview, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, {_NOW_SQL}, {_NOW_SQL})
+    """
+    # Timestamps are assigned by SQLite; read back the one assigned
+    _INSERT_NOTE_RETURNING_SQL = _INSERT_NOTE_SQL + "RETURNING id, created_at"
+    _INSERT_NOTE_VALUES_SQL = f", (?, ?, ?, ?, ?, {_NOW_SQL}, {_NOW_SQL})"
+    _INSERT_TAG_SQL = "INSERT OR IGNORE INTO note_tags (note_id, position, tag) VALUES (?, ?, ?)"
+    _DELETE_TAGS_SQL = "DELETE FROM note_tags WHERE note_id = ?"
+    # Active notes with a tag, found through the note_tags tag index
+    _NOTES_BY_TAG_SQL = """
+        SELECT notes.id, notes.title, notes.content_preview,
+               (SELECT group_concat(tag, char(31)) FROM
+                   (SELECT tag FROM note_tags WHERE note_id = notes.id ORDER BY position)),
+               notes.category, notes.created_at, notes.updated_at
+        FROM note_tags
+        JOIN notes ON notes.id = note_tags.note_id
+        WHERE note_tags.tag = ? AND notes.archived = FALSE
+        ORDER BY notes.updated_at DESC LIMIT ?
+    """
+    # Tags are read from note_tags as one separator-joined string per note
+    # Drive the search from the FTS index and look notes up by rowid. ORDER BY
+    # rank (bm25 by default) lets FTS5 sort the matches itself.
+    _SEARCH_NOTES_SQL = """
+        SELECT n.id, n.title, n.content,
+               (SELECT group_concat(tag, char(31)) FROM
+                   (SELECT tag FROM note_tags WHERE note_id = n.id ORDER BY position)),
+               n.category, n.created_at, n.updated_at
+        FROM notes_search
+        JOIN notes n ON n.id = notes_search.rowid
+        WHERE notes_search MATCH ? AND n.archived = FALSE
+        ORDER BY rank
+        LIMIT ?
+    """
+    # Same search returning an FTS5 snippet around the match in place of the
+    # full content, so large bodies never leave SQLite
+    _SEARCH_PREVIEW_SQL = _SEARCH_NOTES_SQL.replace(
+        "n.content", "snippet(notes_search, 1, '', '', '...', 15)", 1
+    )
+    _GET_NOTE_SQL = """
+        SELECT id, title, content,
+               (SELECT group_concat(tag, char(31)) FROM
+                   (SELECT tag FROM note_tags WHERE note_id = notes.id ORDER BY position)),
+               category, created_at, updated_at, archived
+        FROM notes WHERE id = ?
+    """
+    _ARCHIVE_NOTE_SQL = f"""
+        UPDATE notes SET archived = TRUE, updated_at = {_NOW_SQL}
+        WHERE id = ?
+    """
+    _ARCHIVE_ACTIVE_NOTE_SQL = f"""
+        UPDATE notes SET archived = TRUE, updated_at = {_NOW_SQL}
+        WHERE id = ? AND archived = FALSE
+    """
+    # One UPDATE per combination of updatable columns, keyed by the column tuple.
+    # Writing content also refreshes its stored preview (bound right after it).
+    _UPDATE_NOTE_SQL = {
+        columns: "UPDATE notes SET " + ", ".join(
+            "content = ?, content_preview = ?" if column == 'content' else f"{column} = ?"
+            for column in columns
+        ) + f", updated_at = {_NOW_SQL} WHERE id = ?"
+        for count in range(1, 5)
+        for columns in combinations(('title', 'content', 'tags', 'category'), count)
+    }
     
     def __init__(self, db_path: str = os.path.join(os.path.dirname(__file__), "autoyou_notes.db")):
         self.db_path = self._validate_db_path(db_path)
+        # One long-lived writer connection per tool instance. Tool calls run in
+        # worker threads (check_same_thread=False), so the lock serializes writes.
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self._transaction_owner = None
+        self._conn = self._get_db_connection()
+        self._last_optimize = time.monotonic()
         self._init_notes_database()
+        # Reads use a pool of read-only connections; WAL lets them run
+        # alongside each other and alongside the writer
+        self._readers = queue.SimpleQueue()
+        for _ in range(self.READER_POOL_SIZE):
+            self._readers.put(self._get_db_connection(readonly=True))
+        # Search/list results keyed by (sql, params). Entries are tagged with an
+        # epoch that moves whenever a reader sees that the database changed.
+        self._cache_lock = threading.Lock()
+        self._result_cache = OrderedDict()
+        self._cache_epoch = 0
+        self._reader_versions = {}
+    
+    def close(self):
+        """Close the writer and the pooled read-only connections."""
+        with self._lock:
+            if self._conn is not None:
+                readers, self._readers = self._readers, None
+                # Waits for any borrowed reader to be returned
+                for _ in range(self.READER_POOL_SIZE):
+                    readers.get().close()
+                self._optimize()
+                self._conn.close()
+                self._conn = None
+    
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection for the duration of a query.
+        
+        Inside this thread's transaction() the writer is used instead, so reads
+        see the transaction's uncommitted changes.
+        """
+        if self._transaction_owner == threading.get_ident():
+            yield self._conn
+            return
+        readers = self._readers
+        if readers is None:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        conn = readers.get()
+        try:
+            yield conn
+        finally:
+            readers.put(conn)
+    
+    @contextmanager
+    def transaction(self):
+        """Group several write operations into a single commit.
+        
+        The outermost block runs BEGIN IMMEDIATE ... COMMIT and rolls back if
+        it raises. Write methods called inside it, and nested transaction()
+        blocks, use savepoints, so a failed operation is undone on its own
+        without committing or aborting the surrounding transaction.
+        """
+        with self._lock:
+            if self._transaction_depth:
+                self._conn.execute("SAVEPOINT notes_write")
+                self._transaction_depth += 1
+                try:
+                    yield
+                except BaseException:
+                    self._conn.execute("ROLLBACK TO notes_write")
+                    raise
+                finally:
+                    self._transaction_depth -= 1
+                    self._conn.execute("RELEASE notes_write")
+                return
+            
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._transaction_depth = 1
+            self._transaction_owner = threading.get_ident()
+            try:
+                yield
+            except BaseException:
+                self._conn.rollback()
+                raise
+            else:
+                self._conn.commit()
+            finally:
+                self._transaction_depth = 0
+                self._transaction_owner = None
+    
+    def _read_notes(self, sql: str, params: tuple, convert) -> List[Dict[str, Any]]:
+        """Run a search/list query and convert its rows, using the result cache.
+        
+        PRAGMA data_version on the borrowed reader changes whenever any other
+        connection (this tool's writer or another process) has committed since
+        that reader last checked, so cached results never outlive a write.
+        Reads inside this thread's transaction() bypass the cache.
+        """
+        if not self.RESULT_CACHE_SIZE or self._transaction_owner == threading.get_ident():
+            with self._reader() as conn:
+                return [convert(row) for row in conn.execute(sql, params)]
+        
+        key = (sql, params)
+        with self._reader() as conn:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            with self._cache_lock:
+                if self._reader_versions.get(conn) != version:
+                    self._reader_versions[conn] = version
+                    self._cache_epoch += 1
+                epoch = self._cache_epoch
+                cached = self._result_cache.get(key)
+                if cached is not None and cached[0] == epoch:
+                    self._result_cache.move_to_end(key)
+                    results = cached[1]
+                else:
+                    results = None
+            if results is None:
+                results = [convert(row) for row in conn.execute(sql, params)]
+                with self._cache_lock:
+                    self._result_cache[key] = (epoch, results)
+                    self._result_cache.move_to_end(key)
+                    if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                        self._result_cache.popitem(last=False)
+        
+        # Hand out copies so callers cannot modify the cached notes
+        return [{**note, 'tags': list(note['tags'])} for note in results]
+    
+    def _note_from_row(self, row) -> Dict[str, Any]:
+        """Build a search result from an (id, title, content, tags, category, created_at, updated_at) row."""
+        return {
+            'id': row[0],
+            'title': row[1],
+            'content': row[2],
+            'tags': row[3].split(self.TAG_SEPARATOR) if row[3] else [],
+            'category': row[4],
+            'created_at': row[5],
+            'updated_at': row[6]
+        }
+    
+    def _preview_from_row(self, row) -> Dict[str, Any]:
+        """Build a search result whose third column is a snippet rather than the content."""
+        note = self._note_from_row(row)
+        note['preview'] = note.pop('content')
+        return note
+    
+    def _listing_from_row(self, row) -> Dict[str, Any]:
+        """Build a listing entry from a row whose content column holds the stored preview."""
+        return {
+            'id': row[0],
+            'title': row[1],
+            'content': row[2][:self.CONTENT_TRUNCATE_LENGTH] + '...' if len(row[2]) > self.CONTENT_TRUNCATE_LENGTH else row[2],  # Truncate for listing
+            'tags': row[3].split(self.TAG_SEPARATOR) if row[3] else [],
+            'category': row[4],
+            'created_at': row[5],
+            'updated_at': row[6]
+        }
+    
+    def _optimize(self):
+        """Refresh stale query planner statistics and merge full-text index segments.
+        
+        Every insert, update and delete adds FTS5 segments. A bounded merge step
+        keeps their number, and with it the cost of MATCH ... ORDER BY rank, low.
+        """
+        try:
+            self._conn.execute("PRAGMA optimize")
+            # A negative page count merges segments even below the automerge threshold
+            self._conn.execute("INSERT INTO notes_search(notes_search, rank) VALUES('merge', ?)",
+                               (-self.FTS_MERGE_PAGES,))
+        except sqlite3.Error as e:
+            logger.warning(f"Database maintenance failed: {e}")
+        self._last_optimize = time.monotonic()
+    
+    def _maybe_optimize(self):
+        """Run database maintenance after writes, at most once per OPTIMIZE_INTERVAL."""
+        if time.monotonic() - self._last_optimize > self.OPTIMIZE_INTERVAL:
+            with self._lock:
+                if self._conn is not None and not self._transaction_depth:
+                    self._optimize()
     
     def _validate_db_path(self, db_path: str) -> str:
         """Validate and sanitize database path to prevent path traversal attacks."""
@@ -93,8 +416,9 @@ class NotesTool:
                     raise ValueError("All tags must be strings")
                 if len(tag) > self.MAX_TAG_LENGTH:
                     raise ValueError(f"Tag too long (max {self.MAX_TAG_LENGTH} characters)")
-                # Tags can contain any Unicode characters (global languages and emojis)
-                # No character restrictions for tags
+                if self.TAG_SEPARATOR in tag:
+                    raise ValueError("Tags cannot contain control character U+001F")
+                # Tags can contain any other Unicode characters (global languages and emojis)
         
         if note_id is not None:
             if not isinstance(note_id, int) or note_id <= 0:
@@ -105,31 +429,41 @@ class NotesTool:
                 raise ValueError("Query must be a string")
             if len(query) > self.MAX_QUERY_LENGTH:  # Reasonable limit for search queries
                 raise ValueError(f"Search query too long (max {self.MAX_QUERY_LENGTH} characters)")
-            # Basic FTS injection prevention - remove potentially dangerous characters
-            if any(char in query for char in ['"', "'", ';', '--', '/*', '*/', 'DROP', 'DELETE', 'UPDATE', 'INSERT']):
-                # Instead of raising error, sanitize the query
-                query = re.sub(r'["\';\-\*/]', ' ', query)
-                query = re.sub(r'\b(DROP|DELETE|UPDATE|INSERT|ALTER|CREATE)\b', '', query, flags=re.IGNORECASE)
-                query = ' '.join(query.split())  # Normalize whitespace
-    
-    def _get_db_connection(self):
-        """Get a secure database connection with proper settings."""
+            # The query is bound as a parameter and quoted by _quote_fts_query, so any text is safe
+    
+    def _get_db_connection(self, readonly: bool = False):
+        """Open a secure database connection with proper settings.
+        
+        Args:
+            readonly: Open the existing database read-only (mode=ro) for the reader pool
+        """
         conn = sqlite3.connect(
-            self.db_path,
+            f"{Path(self.db_path).resolve().as_uri()}?mode=ro" if readonly else self.db_path,
             timeout=self.DB_TIMEOUT,  # 30 second timeout
-            check_same_thread=False
+            check_same_thread=False,
+            uri=readonly,
+            cached_statements=self.DB_CACHED_STATEMENTS,
+            # Autocommit mode: transactions are opened explicitly (see transaction())
+            isolation_level=None
         )
-        # Enable foreign key constraints and other security settings
-        conn.execute("PRAGMA foreign_keys = ON")
-        conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
-        conn.execute("PRAGMA synchronous = NORMAL")  # Balance between safety and performance
+        if not readonly:
+            # Enable foreign key constraints and other security settings
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
+            conn.execute("PRAGMA synchronous = NORMAL")  # Balance between safety and performance
+            conn.execute(f"PRAGMA wal_autocheckpoint = {self.DB_WAL_AUTOCHECKPOINT}")
+        conn.execute("PRAGMA temp_store = MEMORY")  # Keep sort/temp tables off disk
+        conn.execute(f"PRAGMA cache_size = -{self.DB_CACHE_SIZE_KIB}")  # Negative value is in KiB
+        conn.execute(f"PRAGMA mmap_size = {self.DB_MMAP_SIZE}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.DB_TIMEOUT * 1000)}")
         return conn
     
     def _init_notes_database(self):
         """Initialize the SQLite database for notes storage."""
         try:
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
+            # Apply the schema and any migrations atomically
+            self._conn.execute("BEGIN IMMEDIATE")
+            cursor = self._conn.cursor()
             
             # Create notes table
             cursor.execute("""
@@ -141,16 +475,51 @@ class NotesTool:
                     category TEXT DEFAULT 'general',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    archived BOOLEAN DEFAULT FALSE
+                    archived BOOLEAN DEFAULT FALSE,
+                    content_preview TEXT
                 )
             """)
             
-            # Create full-text search for notes
+            # Indexes matching list_notes' filters and ordering, so the newest
+            # active notes are read in order without a full scan and sort
             cursor.execute("""
-                CREATE VIRTUAL TABLE IF NOT EXISTS notes_search USING fts5(
-                    title, content, tags, category, content='notes', content_rowid='id'
+                CREATE INDEX IF NOT EXISTS idx_notes_active_updated
+                ON notes(archived, category, updated_at DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_notes_active_updated_all
+                ON notes(archived, updated_at DESC)
+            """)
+            # Serves list_notes' created_at range filters
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_notes_active_created
+                ON notes(archived, created_at)
+            """)
+            
+            # Tags, one row per note and tag, so they can be read without parsing
+            # JSON and filtered by index. notes.tags keeps the JSON copy for FTS.
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'note_tags'")
+            has_tag_table = cursor.fetchone() is not None
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS note_tags (
+                    note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    PRIMARY KEY (note_id, tag)
                 )
             """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags(tag)")
+            if not has_tag_table:
+                # Backfill from the JSON tags of notes created before the table existed
+                cursor.execute("""
+                    INSERT OR IGNORE INTO note_tags (note_id, position, tag)
+                    SELECT notes.id, CAST(json_each.key AS INTEGER), json_each.value
+                    FROM notes, json_each(notes.tags)
+                    WHERE json_valid(notes.tags) AND json_each.type = 'text'
+                """)
+            
+            # Create full-text search for notes, rebuilding it if its definition changed
+            self._ensure_fts_table(cursor)
             
             # Create triggers to keep FTS in sync
             cursor.execute("""
@@ -167,22 +536,67 @@ class NotesTool:
                 END
             """)
             
-            cursor.execute("""
-                CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
-                    INSERT INTO notes_search(notes_search, rowid, title, content, tags, category) 
-                    VALUES('delete', old.id, old.title, old.content, old.tags, old.category);
-                    INSERT INTO notes_search(rowid, title, content, tags, category) 
-                    VALUES (new.id, new.title, new.content, new.tags, new.category);
-                END
-            """)
+            self._ensure_fts_update_trigger(cursor)
             
-            conn.commit()
-            conn.close()
+            # Stored listing previews; databases created before the column
+            # existed get it added and filled
+            cursor.execute("PRAGMA table_info(notes)")
+            if 'content_preview' not in {column[1] for column in cursor.fetchall()}:
+                cursor.execute("ALTER TABLE notes ADD COLUMN content_preview TEXT")
+                cursor.execute("UPDATE notes SET content_preview = substr(content, 1, ?)",
+                               (self.CONTENT_TRUNCATE_LENGTH + 1,))
+            
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] < 2:
+                # Older rows hold either Python's local isoformat() time ('T'
+                # separator, kept as local time with its fractional seconds) or
+                # SQLite's UTC CURRENT_TIMESTAMP (converted to local time), so
+                # every row is stored in the _NOW_SQL form
+                cursor.execute("""
+                    UPDATE notes SET
+                        created_at = CASE WHEN instr(created_at, 'T') THEN replace(created_at, 'T', ' ')
+                                          ELSE strftime('%Y-%m-%d %H:%M:%f', created_at, 'localtime') END,
+                        updated_at = CASE WHEN instr(updated_at, 'T') THEN replace(updated_at, 'T', ' ')
+                                          ELSE strftime('%Y-%m-%d %H:%M:%f', updated_at, 'localtime') END
+                """)
+            cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            
+            self._conn.commit()
             logger.info(f"Notes database initialized at {self.db_path}")
             
         except Exception as e:
+            if self._conn.in_transaction:
+                self._conn.rollback()
             logger.error(f"Failed to initialize notes database: {e}")
-            raise
+            raise NotesError(f"Failed to initialize notes database: {e}") from e
+    
+    def _ensure_fts_table(self, cursor):
+        """Create the FTS table, or recreate and reindex it if its schema is outdated."""
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notes_search'")
+        row = cursor.fetchone()
+        if not row or ' '.join(row[0].split()) != ' '.join(self._FTS_TABLE_SQL.split()):
+            if row:
+                logger.info("Rebuilding notes full-text index with updated schema")
+                cursor.execute("DROP TABLE notes_search")
+            cursor.execute(self._FTS_TABLE_SQL)
+            # Index any notes that already exist (external content table)
+            cursor.execute("INSERT INTO notes_search(notes_search) VALUES('rebuild')")
+        
+        # Persist the column weights used by ORDER BY rank
+        cursor.execute("SELECT v FROM notes_search_config WHERE k = 'rank'")
+        row = cursor.fetchone()
+        if not row or row[0] != self._FTS_RANK:
+            cursor.execute("INSERT INTO notes_search(notes_search, rank) VALUES('rank', ?)", (self._FTS_RANK,))
+    
+    def _ensure_fts_update_trigger(self, cursor):
+        """Create the FTS update trigger, replacing an older definition if present."""
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'notes_au'")
+        row = cursor.fetchone()
+        if row and ' '.join(row[0].split()) == ' '.join(self._FTS_UPDATE_TRIGGER_SQL.split()):
+            return
+        
+        cursor.execute("DROP TRIGGER IF EXISTS notes_au")
+        cursor.execute(self._FTS_UPDATE_TRIGGER_SQL)
     
     def create_note(self, title: str, content: str, tags: Optional[List[str]] = None, category: str = "general") -> Dict[str, Any]:
         """Create a new note.
@@ -199,21 +613,19 @@ class NotesTool:
         try:
             # Validate all inputs
             self._validate_input(title=title, content=content, tags=tags, category=category)
+            tags = self._unique_tags(tags)
             
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            
-            tags_json = json.dumps(tags) if tags else None
-            now = datetime.now().isoformat()
-            
-            cursor.execute("""
-                INSERT INTO notes (title, content, tags, category, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (title, content, tags_json, category, now, now))
+            tags_json = _dump_json(tags) if tags else None
             
-            note_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            # Commits on success and rolls back on error
+            with self.transaction():
+                note_id, created_at = self._conn.execute(
+                    self._INSERT_NOTE_RETURNING_SQL,
+                    (title, content, tags_json, category, self._content_preview(content))
+                ).fetchone()
+                if tags:
+                    self._conn.executemany(self._INSERT_TAG_SQL, self._tag_rows(note_id, tags))
+            self._maybe_optimize()
             
             logger.info(f"Created note with ID: {note_id}")
             return {
@@ -222,7 +634,7 @@ class NotesTool:
                 'title': title,
                 'category': category,
                 'tags': tags or [],
-                'created_at': now
+                'created_at': created_at
             }
             
         except ValueError as e:
@@ -232,8 +644,101 @@ class NotesTool:
             logger.error(f"Failed to create note: {e}")
             return {'success': False, 'error': str(e)}
     
-    def search_notes(self, query: str, limit: int = None) -> List[Dict[str, Any]]:
-        """Search notes using full-text search."""
+    def create_notes(self, notes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create several notes in a single transaction.
+        
+        Args:
+            notes: List of dictionaries with 'title' and 'content', and optional 'tags' and 'category'
+            
+        Returns:
+            Dictionary with the created note IDs or error message
+        """
+        try:
+            if not isinstance(notes, list) or not notes:
+                raise ValueError("Notes must be a non-empty list")
+            if len(notes) > self.MAX_BULK_NOTES:
+                raise ValueError(f"Too many notes (max {self.MAX_BULK_NOTES})")
+            
+            # Validate every note before writing so the batch is all-or-nothing
+            rows = []
+            note_tags = []
+            for note in notes:
+                if not isinstance(note, dict):
+                    raise ValueError("Each note must be a dictionary")
+                title = note.get('title')
+                content = note.get('content')
+                tags = note.get('tags') or []
+                category = note.get('category') or "general"
+                if title is None or content is None:
+                    raise ValueError("Each note requires a title and content")
+                self._validate_input(title=title, content=content, tags=tags, category=category)
+                tags = self._unique_tags(tags)
+                rows.append((title, content, _dump_json(tags) if tags else None, category,
+                             self._content_preview(content)))
+                note_tags.append(tags)
+            
+            note_ids = []
+            with self.transaction():
+                # Multi-row INSERTs return their ids directly. Full chunks share
+                # one statement text, so only the last chunk compiles a new one.
+                for start in range(0, len(rows), self.INSERT_CHUNK_ROWS):
+                    chunk = rows[start:start + self.INSERT_CHUNK_ROWS]
+                    sql = (self._INSERT_NOTE_SQL + self._INSERT_NOTE_VALUES_SQL * (len(chunk) - 1)
+                           + " RETURNING id, created_at")
+                    returned = self._conn.execute(sql, [value for row in chunk for value in row]).fetchall()
+                    # RETURNING order is unspecified; AUTOINCREMENT ids follow the VALUES order
+                    returned.sort()
+                    note_ids.extend(note_id for note_id, _ in returned)
+                    created_at = returned[-1][1]
+                self._conn.executemany(self._INSERT_TAG_SQL, [
+                    tag_row
+                    for note_id, tags in zip(note_ids, note_tags)
+                    for tag_row in self._tag_rows(note_id, tags)
+                ])
+            self._maybe_optimize()
+            
+            logger.info(f"Created {len(note_ids)} notes")
+            return {
+                'success': True,
+                'note_ids': note_ids,
+                'created_at': created_at
+            }
+            
+        except ValueError as e:
+            logger.warning(f"Invalid input for create_notes: {e}")
+            return {'success': False, 'error': f"Invalid input: {str(e)}"}
+        except Exception as e:
+            logger.error(f"Failed to create notes: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    def _content_preview(self, content: str) -> str:
+        """Prefix of the content stored for listings.
+        
+        One character past CONTENT_TRUNCATE_LENGTH is kept so that listings
+        can tell whether the content was truncated.
+        """
+        return content[:self.CONTENT_TRUNCATE_LENGTH + 1]
+    
+    def _unique_tags(self, tags: Optional[List[str]]) -> Optional[List[str]]:
+        """Drop repeated tags, keeping first occurrences in order.
+        
+        note_tags holds one row per note and tag, so deduplicating before
+        the write keeps the JSON copy, the write result and later reads equal.
+        """
+        return list(dict.fromkeys(tags)) if tags else tags
+    
+    def _tag_rows(self, note_id: int, tags: List[str]) -> List[tuple]:
+        """Build note_tags rows for a note, keeping the tags' order."""
+        return [(note_id, position, tag) for position, tag in enumerate(tags)]
+    
+    def search_notes(self, query: str, limit: int = None, preview: bool = False) -> List[Dict[str, Any]]:
+        """Search notes using full-text search.
+        
+        Args:
+            query: Search terms
+            limit: Maximum number of results (optional)
+            preview: Return a short 'preview' excerpt around the match instead of the full 'content'
+        """
         try:
             # Validate inputs
             self._validate_input(query=query)
@@ -243,55 +748,40 @@ class NotesTool:
             elif not isinstance(limit, int) or limit <= 0 or limit > self.SEARCH_LIMIT_MAX:
                 limit = self.DEFAULT_SEARCH_LIMIT  # Default safe limit
             
-            # Sanitize query for FTS
-            sanitized_query = self._sanitize_fts_query(query)
-            if not sanitized_query.strip():
-                return []  # Empty query after sanitization
-            
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
+            # Quote each term so FTS treats the query as plain text
+            fts_query = self._quote_fts_query(query)
+            if not fts_query:
+                return []  # Empty query
             
             # Use FTS for search
-            cursor.execute("""
-                SELECT n.id, n.title, n.content, n.tags, n.category, n.created_at, n.updated_at
-                FROM notes n
-                JOIN notes_search ns ON n.id = ns.rowid
-                WHERE notes_search MATCH ? AND n.archived = FALSE
-                ORDER BY rank
-                LIMIT ?
-            """, (sanitized_query, limit))
-            
-            results = []
-            for row in cursor.fetchall():
-                tags = json.loads(row[3]) if row[3] else []
-                results.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'content': row[2],
-                    'tags': tags,
-                    'category': row[4],
-                    'created_at': row[5],
-                    'updated_at': row[6]
-                })
-            
-            conn.close()
-            return results
+            if preview:
+                return self._read_notes(self._SEARCH_PREVIEW_SQL, (fts_query, limit), self._preview_from_row)
+            return self._read_notes(self._SEARCH_NOTES_SQL, (fts_query, limit), self._note_from_row)
             
         except Exception as e:
             logger.error(f"Failed to search notes: {e}")
             return []
     
-    def _sanitize_fts_query(self, query: str) -> str:
-        """Sanitize FTS query to prevent injection attacks."""
-        # Remove potentially dangerous FTS operators and SQL keywords
-        query = re.sub(r'["\';\-\*/]', ' ', query)
-        query = re.sub(r'\b(DROP|DELETE|UPDATE|INSERT|ALTER|CREATE|MATCH)\b', '', query, flags=re.IGNORECASE)
-        
-        # Remove FTS-specific operators that could be misused
-        query = re.sub(r'[\^\$\*\+\?\{\}\[\]\(\)\|\\]', ' ', query)
+    def _quote_fts_query(self, query: str) -> str:
+        """Turn a search query into FTS5 string terms, one per word.
         
-        # Normalize whitespace and return
-        return ' '.join(query.split())
+        Each word becomes a double-quoted FTS5 string (embedded quotes doubled),
+        so operators, column filters and keywords are matched as literal text.
+        A trailing '*' is kept outside the quotes as a prefix search. The terms
+        are implicitly ANDed, as unquoted words would be.
+        """
+        if '"' not in query and '*' not in query:
+            # Common case: nothing to escape, so quote all words with one join
+            words = query.split()
+            return '"' + '" "'.join(words) + '"' if words else ''
+        terms = []
+        for term in query.split():
+            prefix = term.endswith('*') and term.rstrip('*')
+            if prefix:
+                terms.append('"' + prefix.replace('"', '""') + '"*')
+            else:
+                terms.append('"' + term.replace('"', '""') + '"')
+        return ' '.join(terms)
     
     def get_note(self, note_id: int) -> Optional[Dict[str, Any]]:
         """Get a specific note by ID."""
@@ -299,19 +789,11 @@ class NotesTool:
             # Validate input
             self._validate_input(note_id=note_id)
             
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, title, content, tags, category, created_at, updated_at, archived
-                FROM notes WHERE id = ?
-            """, (note_id,))
-            
-            row = cursor.fetchone()
-            conn.close()
+            with self._reader() as conn:
+                row = conn.execute(self._GET_NOTE_SQL, (note_id,)).fetchone()
             
             if row:
-                tags = json.loads(row[3]) if row[3] else []
+                tags = row[3].split(self.TAG_SEPARATOR) if row[3] else []
                 return {
                     'id': row[0],
                     'title': row[1],
@@ -335,43 +817,40 @@ class NotesTool:
         try:
             # Validate all inputs
             self._validate_input(note_id=note_id, title=title, content=content, tags=tags, category=category)
+            tags = self._unique_tags(tags)
             
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            
-            # Build dynamic update query using whitelisted columns only
-            updates = []
+            # Pick the precomputed UPDATE for the provided (whitelisted) columns
+            columns = []
             params = []
             
             if title is not None:
-                updates.append("title = ?")
+                columns.append('title')
                 params.append(title)
             
             if content is not None:
-                updates.append("content = ?")
+                columns.append('content')
                 params.append(content)
+                params.append(self._content_preview(content))
             
             if tags is not None:
-                updates.append("tags = ?")
-                params.append(json.dumps(tags))
+                columns.append('tags')
+                params.append(_dump_json(tags))
             
             if category is not None:
-                updates.append("category = ?")
+                columns.append('category')
                 params.append(category)
             
-            if not updates:
+            if not columns:
                 return False
             
-            updates.append("updated_at = CURRENT_TIMESTAMP")
             params.append(note_id)
-            
-            # Use parameterized query - safe because we control the column names
-            query = f"UPDATE notes SET {', '.join(updates)} WHERE id = ?"
-            cursor.execute(query, params)
-            
-            success = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
+            query = self._UPDATE_NOTE_SQL[tuple(columns)]
+            with self.transaction():
+                success = self._conn.execute(query, params).rowcount > 0
+                if success and tags is not None:
+                    self._conn.execute(self._DELETE_TAGS_SQL, (note_id,))
+                    self._conn.executemany(self._INSERT_TAG_SQL, self._tag_rows(note_id, tags))
+            self._maybe_optimize()
             
             if success:
                 logger.info(f"Updated note {note_id}")
@@ -387,17 +866,9 @@ class NotesTool:
             # Validate input
             self._validate_input(note_id=note_id)
             
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE notes SET archived = TRUE, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (note_id,))
-            
-            success = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
+            with self.transaction():
+                success = self._conn.execute(self._ARCHIVE_NOTE_SQL, (note_id,)).rowcount > 0
+            self._maybe_optimize()
             
             if success:
                 logger.info(f"Archived note {note_id}")
@@ -407,6 +878,33 @@ class NotesTool:
             logger.error(f"Failed to delete note {note_id}: {e}")
             return False
     
+    def delete_notes(self, note_ids: List[int]) -> int:
+        """Delete (archive) several notes in a single transaction.
+        
+        Returns:
+            Number of notes archived
+        """
+        try:
+            if not isinstance(note_ids, list) or not note_ids:
+                raise ValueError("Note IDs must be a non-empty list")
+            if len(note_ids) > self.MAX_BULK_NOTES:
+                raise ValueError(f"Too many notes (max {self.MAX_BULK_NOTES})")
+            for note_id in note_ids:
+                self._validate_input(note_id=note_id)
+            
+            with self.transaction():
+                archived = self._conn.executemany(
+                    self._ARCHIVE_ACTIVE_NOTE_SQL, [(note_id,) for note_id in note_ids]
+                ).rowcount
+            self._maybe_optimize()
+            
+            logger.info(f"Archived {archived} notes")
+            return archived
+            
+        except Exception as e:
+            logger.error(f"Failed to delete notes {note_ids}: {e}")
+            return 0
+    
     def _validate_date_input(self, date_filter: Optional[str] = None) -> Optional[str]:
         """Validate and normalize date input for filtering."""
         if date_filter is None:
@@ -418,37 +916,40 @@ class NotesTool:
         # Handle common date formats and keywords
         date_filter = date_filter.lower().strip()
         
-        if date_filter in ['today', 'now']:
-            return datetime.now().date().isoformat()
-        elif date_filter == 'yesterday':
-            yesterday = datetime.now().date() - timedelta(days=1)
-            return yesterday.isoformat()
-        elif date_filter in ['this week', 'week']:
-            # Return start of current week (Monday)
-            today = datetime.now().date()
-            days_since_monday = today.weekday()
-            week_start = today - timedelta(days=days_since_monday)
-            return week_start.isoformat()
-        elif date_filter in ['this month', 'month']:
-            # Return start of current month
-            today = datetime.now().date()
-            month_start = today.replace(day=1)
-            return month_start.isoformat()
-        else:
+        keyword_date = self._KEYWORD_DATES.get(date_filter)
+        if keyword_date is not None:
+            return keyword_date(date.today()).isoformat()
+        
+        match = self._SLASH_DATE.fullmatch(date_filter)
+        if match:
+            if match.group(3):
+                first, second, year = map(int, match.group(1, 2, 3))
+                # Month first, or day first when that is the only valid reading
+                candidates = ((year, first, second), (year, second, first))
+            else:
+                candidates = (tuple(map(int, match.group(4, 5, 6))),)
+            for year, month, day in candidates:
+                try:
+                    return date(year, month, day).isoformat()
+                except ValueError:
+                    continue
+        elif '/' not in date_filter:
             # Try to parse as ISO date (YYYY-MM-DD)
             try:
-                parsed_date = datetime.fromisoformat(date_filter).date()
-                return parsed_date.isoformat()
+                return datetime.fromisoformat(date_filter).date().isoformat()
             except ValueError:
-                # Try other common formats
-                for fmt in ['%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d']:
+                match = self._DASH_DATE.fullmatch(date_filter)
+                if match:
                     try:
-                        parsed_date = datetime.strptime(date_filter, fmt).date()
-                        return parsed_date.isoformat()
+                        return date(*map(int, match.groups())).isoformat()
                     except ValueError:
-                        continue
-                raise ValueError(f"Invalid date format: {date_filter}. Use YYYY-MM-DD, 'today', 'yesterday', 'this week', or 'this month'")
+                        pass
+        raise ValueError(f"Invalid date format: {date_filter}. Use YYYY-MM-DD, 'today', 'yesterday', 'this week', or 'this month'")
 
+    def _next_day(self, date_str: str) -> str:
+        """Return the ISO date following a normalized YYYY-MM-DD date."""
+        return (datetime.fromisoformat(date_str) + timedelta(days=1)).date().isoformat()
+    
     def list_notes(self, category: Optional[str] = None, limit: int = None, 
                    created_after: Optional[str] = None, created_before: Optional[str] = None,
                    created_on: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -476,9 +977,6 @@ class NotesTool:
             created_before_date = self._validate_date_input(created_before)
             created_on_date = self._validate_date_input(created_on)
             
-            conn = self._get_db_connection()
-            cursor = conn.cursor()
-            
             # Build dynamic query
             where_conditions = ["archived = FALSE"]
             params = []
@@ -487,48 +985,61 @@ class NotesTool:
                 where_conditions.append("category = ?")
                 params.append(category)
             
+            # Compare created_at directly against day boundaries so the index on
+            # it can be used. A bare YYYY-MM-DD sorts before every timestamp on
+            # that day, whether stored with a 'T' or a space separator.
             if created_on_date:
                 # For "created on" we want the entire day
-                where_conditions.append("DATE(created_at) = ?")
-                params.append(created_on_date)
+                where_conditions.append("created_at >= ? AND created_at < ?")
+                params.extend((created_on_date, self._next_day(created_on_date)))
             else:
                 if created_after_date:
-                    where_conditions.append("DATE(created_at) >= ?")
+                    where_conditions.append("created_at >= ?")
                     params.append(created_after_date)
                 
                 if created_before_date:
-                    where_conditions.append("DATE(created_at) <= ?")
-                    params.append(created_before_date)
+                    where_conditions.append("created_at < ?")
+                    params.append(self._next_day(created_before_date))
             
             where_clause = " AND ".join(where_conditions)
             params.append(limit)
             
+            # Read the stored preview instead of the full body
             query = f"""
-                SELECT id, title, content, tags, category, created_at, updated_at
+                SELECT id, title, content_preview,
+                       (SELECT group_concat(tag, char(31)) FROM
+                           (SELECT tag FROM note_tags WHERE note_id = notes.id ORDER BY position)),
+                       category, created_at, updated_at
                 FROM notes WHERE {where_clause}
                 ORDER BY updated_at DESC LIMIT ?
             """
             
-            cursor.execute(query, params)
+            return self._read_notes(query, tuple(params), self._listing_from_row)
             
-            results = []
-            for row in cursor.fetchall():
-                tags = json.loads(row[3]) if row[3] else []
-                results.append({
-                    'id': row[0],
-                    'title': row[1],
-                    'content': row[2][:self.CONTENT_TRUNCATE_LENGTH] + '...' if len(row[2]) > self.CONTENT_TRUNCATE_LENGTH else row[2],  # Truncate for listing
-                    'tags': tags,
-                    'category': row[4],
-                    'created_at': row[5],
-                    'updated_at': row[6]
-                })
+        except Exception as e:
+            logger.error(f"Failed to list notes: {e}")
+            return []
+    
+    def search_by_tag(self, tag: str, limit: int = None) -> List[Dict[str, Any]]:
+        """List active notes that have the given tag, most recently updated first.
+        
+        Args:
+            tag: Exact tag to look for
+            limit: Maximum number of results (optional)
+        """
+        try:
+            # Validate inputs
+            self._validate_input(tags=[tag])
+            
+            if limit is None:
+                limit = self.DEFAULT_LIST_LIMIT
+            elif not isinstance(limit, int) or limit <= 0 or limit > self.SEARCH_LIMIT_MAX:
+                limit = self.DEFAULT_LIST_LIMIT  # Default safe limit
             
-            conn.close()
-            return results
+            return self._read_notes(self._NOTES_BY_TAG_SQL, (tag, limit), self._listing_from_row)
             
         except Exception as e:
-            logger.error(f"Failed to list notes: {e}")
+            logger.error(f"Failed to search notes by tag: {e}")
             return []
     
     def get_tool(self) -> FunctionTool:
@@ -538,11 +1049,12 @@ class NotesTool:
                           tags: Optional[List[str]] = None, category: Optional[str] = None,
                           query: Optional[str] = None, note_id: Optional[int] = None, 
                           limit: Optional[int] = None, created_after: Optional[str] = None,
-                          created_before: Optional[str] = None, created_on: Optional[str] = None) -> str:
+                          created_before: Optional[str] = None, created_on: Optional[str] = None,
+                          notes: Optional[List[Dict[str, Any]]] = None) -> str:
             """Handle notes operations with comprehensive input validation.
             
             Args:
-                action: The action to perform (create, search, get, list, update, delete)
+                action: The action to perform (create, create_bulk, search, get, list, update, delete)
                 title: Note title (required for create, optional for update)
                 content: Note content (required for create, optional for update)
                 tags: List of tags for the note
@@ -553,13 +1065,14 @@ class NotesTool:
                 created_after: Filter notes created after this date (YYYY-MM-DD or 'today', 'yesterday', etc.)
                 created_before: Filter notes created before this date (YYYY-MM-DD or 'today', 'yesterday', etc.)
                 created_on: Filter notes created on this specific date (YYYY-MM-DD or 'today', 'yesterday', etc.)
+                notes: Notes to create for create_bulk, each a dict with 'title', 'content' and optional 'tags' and 'category'
             
             Returns:
                 String result of the operation
             """
             try:
                 # Validate action parameter
-                valid_actions = {"create", "search", "get", "list", "update", "delete"}
+                valid_actions = {"create", "create_bulk", "search", "get", "list", "update", "delete"}
                 if not action or action not in valid_actions:
                     return f"Error: Invalid action '{action}'. Available actions: {', '.join(valid_actions)}"
                 
@@ -583,23 +1096,37 @@ class NotesTool:
                     else:
                         return f"❌ Failed to create note: {result['error']}"
                 
+                elif action == "create_bulk":
+                    if not notes:
+                        return "Error: A list of notes is required to create notes in bulk."
+                    
+                    # One transaction for the whole batch
+                    result = self.create_notes(notes)
+                    if result['success']:
+                        return f"✅ Created {len(result['note_ids'])} notes!\n🆔 IDs: {', '.join(map(str, result['note_ids']))}"
+                    else:
+                        return f"❌ Failed to create notes: {result['error']}"
+                
                 elif action == "search":
                     if not query or not query.strip():
                         return "Error: Search query is required."
                     
-                    results = self.search_notes(query, limit)
+                    results = self.search_notes(query, limit, preview=True)
                     if not results:
                         return f"🔍 No notes found matching '{query}'"
                     
-                    response = f"🔍 Found {len(results)} note(s) matching '{query}':\n\n"
+                    # Collect the pieces and join once instead of growing a string
+                    parts = [f"🔍 Found {len(results)} note(s) matching '{query}':\n\n"]
                     for note in results:
                         tags_str = f" 🏷️ {', '.join(note['tags'])}" if note['tags'] else ""
-                        response += f"📝 **{note['title']}** (ID: {note['id']})\n"
-                        response += f"   📂 Category: {note['category']}{tags_str}\n"
-                        response += f"   📄 Content: {note['content'][:100]}{'...' if len(note['content']) > 100 else ''}\n"
-                        response += f"   📅 Created: {note['created_at']}\n\n"
+                        parts.append(
+                            f"📝 **{note['title']}** (ID: {note['id']})\n"
+                            f"   📂 Category: {note['category']}{tags_str}\n"
+                            f"   📄 Content: {note['preview']}\n"
+                            f"   📅 Created: {note['created_at']}\n\n"
+                        )
                     
-                    return response.strip()
+                    return "".join(parts).strip()
                 
                 elif action == "get":
                     if note_id is None:
@@ -654,14 +1181,16 @@ class NotesTool:
                     
                     filter_text = " (" + ", ".join(filter_desc) + ")" if filter_desc else ""
                     
-                    response = f"📋 Your notes{filter_text}:\n\n"
+                    parts = [f"📋 Your notes{filter_text}:\n\n"]
                     for i, note in enumerate(results, 1):
                         tags_str = f" 🏷️ {', '.join(note['tags'])}" if note['tags'] else ""
-                        response += f"{i}. **{note['title']}** ({note['category']}){tags_str}\n"
-                        response += f"   📄 Content: {note['content']}\n"
-                        response += f"   📅 Created: {note['created_at']}\n\n"
+                        parts.append(
+                            f"{i}. **{note['title']}** ({note['category']}){tags_str}\n"
+                            f"   📄 Content: {note['content']}\n"
+                            f"   📅 Created: {note['created_at']}\n\n"
+                        )
                     
-                    return response.strip()
+                    return "".join(parts).strip()
 
                 elif action == "update":
                     if note_id is None:
@@ -12,12 +12,42 @@
 Simplified test script for basic agent functionality.
 """
 
+import asyncio
+import importlib
 import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _import_notes_module(name):
+    """Import a notes_agent module, whether run with -m or collected by pytest."""
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    # pytest imports this file as a top-level module; make the package importable
+    repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if repo_dir not in sys.path:
+        sys.path.insert(0, repo_dir)
+    return importlib.import_module(f"notes_agent.{name}")
+
+@contextmanager
+def _temporary_notes_tool():
+    """Yield a NotesTool backed by a database in a temporary directory."""
+    NotesTool = _import_notes_module("notes_tool").NotesTool
+    with tempfile.TemporaryDirectory() as tmp:
+        tool = NotesTool(os.path.join(tmp, "notes.db"))
+        try:
+            yield tool
+        finally:
+            tool.close()
+
 def test_basic_functionality():
     """Test basic agent functionality."""
     print("\n=== Testing Basic Functionality ===")
@@ -26,24 +56,195 @@ def test_basic_functionality():
         from .agent import create_note, search_notes, list_notes
         
         # Test creating a note
-        result = create_note(title="Test Note", content="This is a test note", tags=["test"])
+        result = asyncio.run(create_note(title="Test Note", content="This is a test note", tags=["test"]))
         print(f"Create Note Result: {result}")
         
         # Test listing notes
-        result = list_notes(limit=5)
+        result = asyncio.run(list_notes(limit=5))
         print(f"List Notes Result: {result}")
         
         # Test searching notes
-        result = search_notes(query="test", limit=5)
+        result = asyncio.run(search_notes(query="test", limit=5))
         print(f"Search Notes Result: {result}")
         
     except Exception as e:
         print(f"Error: {e}")
 
+def test_date_filter_local_offset():
+    """Test that date filters and stored timestamps follow the local time zone."""
+    print("\n=== Testing Date Filters at Non-UTC Offsets ===")
+    if not hasattr(time, "tzset"):
+        print("Skipped: time.tzset is not available on this platform")
+        return
+    
+    original_tz = os.environ.get("TZ")
+    try:
+        # At any moment at least one of these zones is on a different
+        # calendar day than UTC
+        for tz in ("Etc/GMT-14", "Etc/GMT+12"):
+            os.environ["TZ"] = tz
+            time.tzset()
+            with _temporary_notes_tool() as tool:
+                created = tool.create_note(title="Offset Note", content="Created at a non-UTC offset")
+                assert created['success'], created
+                today = date.today().isoformat()
+                assert created['created_at'].startswith(today), (tz, created['created_at'], today)
+                
+                for created_on in ("today", today):
+                    notes = tool.list_notes(created_on=created_on)
+                    assert [note['id'] for note in notes] == [created['note_id']], (tz, created_on)
+                assert tool.list_notes(created_on="yesterday") == [], tz
+                print(f"✅ 'today' matches the local date in {tz}")
+    finally:
+        if original_tz is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = original_tz
+        time.tzset()
+
+def test_date_filter_formats():
+    """Test that date filters accept ISO dates with and without zero padding."""
+    print("\n=== Testing Date Filter Formats ===")
+    with _temporary_notes_tool() as tool:
+        created = tool.create_note(title="Dated Note", content="Created today")
+        assert created['success'], created
+        today = date.today()
+        for created_on in (today.isoformat(), f"{today.year}-{today.month}-{today.day}",
+                           f"{today.month}/{today.day}/{today.year}"):
+            assert tool._validate_date_input(created_on) == today.isoformat(), created_on
+            notes = tool.list_notes(created_on=created_on)
+            assert [note['id'] for note in notes] == [created['note_id']], created_on
+        assert tool._validate_date_input("2025-1-5") == "2025-01-05"
+        for invalid in ("2025-2-30", "2025-1-5x"):
+            try:
+                tool._validate_date_input(invalid)
+            except ValueError:
+                continue
+            assert False, f"Accepted invalid date {invalid!r}"
+        print("✅ Padded, non-padded and slash dates filter the same notes")
+
+def test_duplicate_tags():
+    """Test that repeated tags are dropped consistently on write and read."""
+    print("\n=== Testing Duplicate Tags ===")
+    with _temporary_notes_tool() as tool:
+        created = tool.create_note(title="Tagged Note", content="Tags", tags=["a", "a", "b"])
+        assert created['tags'] == ["a", "b"], created
+        assert tool.get_note(created['note_id'])['tags'] == ["a", "b"]
+        
+        bulk = tool.create_notes([{"title": "Bulk Note", "content": "Tags", "tags": ["c", "c"]}])
+        assert tool.get_note(bulk['note_ids'][0])['tags'] == ["c"]
+        
+        assert tool.update_note(created['note_id'], tags=["z", "a", "z"])
+        assert tool.get_note(created['note_id'])['tags'] == ["z", "a"]
+        assert [note['tags'] for note in tool.search_by_tag("z")] == [["z", "a"]]
+        print("✅ Create results and later reads agree on deduplicated tags")
+
+def test_bulk_operations_roll_back():
+    """Test that bulk create and delete are all-or-nothing when a row fails."""
+    print("\n=== Testing Bulk Operation Rollback ===")
+    with _temporary_notes_tool() as tool:
+        # Fail inside SQLite, after validation, on one row of each batch
+        tool._conn.executescript("""
+            CREATE TRIGGER reject_bad_insert BEFORE INSERT ON notes WHEN new.title = 'Bad Row'
+            BEGIN SELECT RAISE(ABORT, 'rejected insert'); END;
+            CREATE TRIGGER reject_bad_archive BEFORE UPDATE OF archived ON notes WHEN old.title = 'Keep Me'
+            BEGIN SELECT RAISE(ABORT, 'rejected archive'); END;
+        """)
+        
+        result = tool.create_notes([
+            {"title": "Good Row", "content": "First", "tags": ["bulk"]},
+            {"title": "Bad Row", "content": "Second", "tags": ["bulk"]},
+        ])
+        assert not result['success'], result
+        assert tool.list_notes() == [] and tool.search_by_tag("bulk") == []
+        print("✅ Failed bulk create left no notes or tags behind")
+        
+        result = tool.create_notes([
+            {"title": "Archive Me", "content": "First"},
+            {"title": "Keep Me", "content": "Second"},
+        ])
+        assert result['success'], result
+        assert tool.delete_notes(result['note_ids']) == 0
+        assert sorted(note['id'] for note in tool.list_notes()) == result['note_ids']
+        print("✅ Failed bulk delete archived nothing")
+        
+        # A failed bulk create inside an outer transaction only undoes itself
+        with tool.transaction():
+            outer = tool.create_note(title="Outer Note", content="Kept")
+            assert not tool.create_notes([{"title": "Bad Row", "content": "Rejected"}])['success']
+        assert tool.get_note(outer['note_id']) is not None
+        assert len(tool.list_notes()) == 3
+        print("✅ Savepoint rollback kept the surrounding transaction")
+
+def test_search_notes_by_tag():
+    """Test the bulk and tag search tools end to end on a temporary database."""
+    print("\n=== Testing Tag Search ===")
+    notes_agent_module = _import_notes_module("agent")
+    with _temporary_notes_tool() as tool:
+        original_get_notes_tool = notes_agent_module._get_notes_tool
+        notes_agent_module._get_notes_tool = lambda: tool
+        try:
+            created = asyncio.run(notes_agent_module.bulk_create_notes([
+                {"title": "Standup", "content": "Daily sync", "tags": ["work", "meeting"]},
+                {"title": "Groceries", "content": "Milk", "tags": ["home"]},
+                {"title": "Retro", "content": "Sprint review", "tags": ["meeting"]},
+            ]))
+            assert created['status'] == "success" and created['count'] == 3, created
+            standup_id, _, retro_id = created['note_ids']
+            
+            result = asyncio.run(notes_agent_module.search_notes_by_tag("meeting"))
+            assert result['status'] == "success", result
+            assert sorted(note['id'] for note in result['notes']) == [standup_id, retro_id]
+            assert all("meeting" in note['tags'] for note in result['notes'])
+            # Exact tag match only
+            assert asyncio.run(notes_agent_module.search_notes_by_tag("meet"))['count'] == 0
+            
+            deleted = asyncio.run(notes_agent_module.bulk_delete_notes([standup_id]))
+            assert deleted['status'] == "success" and deleted['count'] == 1, deleted
+            result = asyncio.run(notes_agent_module.search_notes_by_tag("meeting"))
+            assert [note['id'] for note in result['notes']] == [retro_id]
+            print("✅ Tag search finds exact tags and skips archived notes")
+        finally:
+            notes_agent_module._get_notes_tool = original_get_notes_tool
+
+def test_result_cache_sees_external_writes():
+    """Test that cached list/search results are dropped after another connection writes."""
+    print("\n=== Testing Result Cache Invalidation ===")
+    with _temporary_notes_tool() as tool:
+        created = tool.create_note(title="Cached Note", content="Cached content", tags=["cache"])
+        assert created['success'], created
+        # Warm the cache
+        assert len(tool.list_notes()) == 1
+        assert len(tool.search_notes("cached")) == 1
+        assert len(tool.search_by_tag("cache")) == 1
+        
+        external = sqlite3.connect(tool.db_path)
+        try:
+            with external:
+                external.execute(
+                    "INSERT INTO notes (title, content, tags, category, content_preview) VALUES (?, ?, ?, ?, ?)",
+                    ("External Note", "Cached content from elsewhere", None, "general",
+                     "Cached content from elsewhere")
+                )
+                external.execute("UPDATE notes SET archived = TRUE WHERE id = ?", (created['note_id'],))
+        finally:
+            external.close()
+        
+        assert [note['title'] for note in tool.list_notes()] == ["External Note"]
+        assert [note['title'] for note in tool.search_notes("cached")] == ["External Note"]
+        assert tool.search_by_tag("cache") == []
+        print("✅ Writes from another connection invalidated cached results")
+
 if __name__ == "__main__":
     print("AutoYou Notes Agent Test")
     print("========================")
     
     test_basic_functionality()
+    test_date_filter_local_offset()
+    test_date_filter_formats()
+    test_duplicate_tags()
+    test_bulk_operations_roll_back()
+    test_search_notes_by_tag()
+    test_result_cache_sees_external_writes()
     
     print("\nTest completed!")
\ No newline at end of file
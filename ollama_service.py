@@ -15,61 +15,131 @@ including model discovery, availability checking, and on-demand client initializ
 """
 import logging
 import os
-from typing import Optional, List, Dict, Any
+import time
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 
+import httpx
 import ollama
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _strip_model_prefix(model_name: str) -> str:
+    """Remove a provider prefix such as ollama_chat/, ollama/ or openapi/ from a model name."""
+    return model_name.split('/', 1)[1] if '/' in model_name else model_name
+
+
 class OllamaService:
     """Simplified service for getting available OLLAMA models."""
 
+    # Seconds a fetched model list is reused before OLLAMA is queried again
+    MODELS_CACHE_TTL = 30.0
+
+    # Pool settings for the HTTP client; idle connections stay open long
+    # enough to be reused when the model cache is refreshed
+    HTTP_LIMITS = httpx.Limits(
+        max_connections=10,
+        max_keepalive_connections=10,
+        keepalive_expiry=MODELS_CACHE_TTL
+    )
+
     def __init__(self):
         self.client = None
         self.ollama_available = False
+        # (fetched at, models, models by name, latest model name)
+        self._models_cache: Optional[
+            Tuple[float, List[Dict[str, Any]], Dict[str, Dict[str, Any]], Optional[str]]
+        ] = None
+        # Default model name once resolved; kept until clear_cache()
+        self._resolved_default: Optional[str] = None
         # Get default model from environment variable or use fallback
-        default_model_env = os.getenv('OLLAMA_MODEL', 'qwen3:4b')
         # Remove ollama_chat/ or ollama/ or openapi/ prefix if present
-        if '/' in default_model_env:
-            self.default_model = default_model_env.split('/', 1)[1]
-        else:
-            self.default_model = default_model_env
+        self.default_model = _strip_model_prefix(os.getenv('OLLAMA_MODEL', 'qwen3:4b'))
 
     def _get_client(self):
-        """Get or create OLLAMA client on demand."""
-        if self.client is None:
+        """Get or create OLLAMA client on demand.
+
+        The client (and its keep-alive connection pool) is created once and
+        reused for every probe, including retries after a failed connection.
+        """
+        if not self.ollama_available:
+            # Use OLLAMA_API_BASE environment variable if set
+            api_base = os.getenv('OLLAMA_API_BASE', 'http://localhost:11434')
             try:
-                # Use OLLAMA_API_BASE environment variable if set
-                api_base = os.getenv('OLLAMA_API_BASE', 'http://localhost:11434')
-                self.client = ollama.Client(host=api_base)
-                # Test the connection
-                self.client.list()
+                if self.client is None:
+                    self.client = ollama.Client(host=api_base, limits=self.HTTP_LIMITS)
+                # Test the connection and seed the model cache with the result
+                self._cache_models(self.client.list())
                 self.ollama_available = True
                 logger.info("OLLAMA is available at %s", api_base)
             except Exception as e:  # pylint: disable=broad-exception-caught
                 logger.warning("OLLAMA not available: %s", str(e))
                 self.ollama_available = False
-                self.client = None
+                return None
         return self.client
 
+    def close(self):
+        """Close the pooled HTTP connections held by the OLLAMA client."""
+        if self.client is not None:
+            # ollama.Client does not expose close(); release its httpx pool directly
+            self.client._client.close()  # pylint: disable=protected-access
+            self.client = None
+        self.ollama_available = False
+
     def _check_ollama_availability(self) -> bool:
         """Check if OLLAMA is installed and available."""
         client = self._get_client()
         return client is not None and self.ollama_available
 
-    def get_available_models(self) -> List[Dict[str, Any]]:
-        """Get list of available models from OLLAMA."""
+    def _cache_models(self, response):
+        """Store the models from an OLLAMA list response in the TTL cache.
+
+        The name index and the latest model are derived here, once per
+        refresh, so lookups do not scan or sort the list.
+        """
+        models = response.get('models', [])
+        by_name = {}
+        for model in models:
+            by_name.setdefault(model['model'], model)
+
+        latest = None
+        if models:
+            # Sort by modified time if available, otherwise use the first
+            try:
+                latest = max(models, key=lambda x: x.get('modified_at', ''))['model']
+            except (KeyError, TypeError):
+                latest = models[0]['model']
+
+        self._models_cache = (time.monotonic(), models, by_name, latest)
+        return self._models_cache
+
+    def _get_models_cache(self):
+        """Return the model cache entry, refreshing it once the TTL has passed."""
         if not self._check_ollama_availability():
             logger.warning("OLLAMA is not available")
-            return []
+            return None
+
+        if self._models_cache is not None:
+            if time.monotonic() - self._models_cache[0] < self.MODELS_CACHE_TTL:
+                return self._models_cache
 
         try:
-            models = self.client.list()
-            return models.get('models', [])
+            return self._cache_models(self.client.list())
         except Exception as e:  # pylint: disable=broad-exception-caught
             logger.error("Error getting available models: %s", str(e))
-            return []
+            return None
+
+    def get_available_models(self) -> List[Dict[str, Any]]:
+        """Get list of available models from OLLAMA, reusing a recent result."""
+        cache = self._get_models_cache()
+        return cache[1] if cache else []
+
+    def clear_cache(self):
+        """Drop the cached model list and default so the next lookup queries OLLAMA."""
+        self._models_cache = None
+        self._resolved_default = None
 
     def list_models(self) -> List[str]:
         """Get list of available model names."""
@@ -83,36 +153,34 @@ class OllamaService:
 
     def get_latest_model(self) -> Optional[str]:
         """Get the latest model (first in the list)."""
-        models = self.get_available_models()
-        if not models:
-            return None
-
-        # Sort by modified time if available, otherwise return first
-        try:
-            sorted_models = sorted(
-                models,
-                key=lambda x: x.get('modified_at', ''),
-                reverse=True
-            )
-            return sorted_models[0]['model']
-        except (KeyError, TypeError):
-            return models[0]['model'] if models else None
+        cache = self._get_models_cache()
+        return cache[3] if cache else None
 
     def get_model_by_name(self, model_name: str) -> Optional[Dict[str, Any]]:
-        """Get model information by name."""
-        models = self.get_available_models()
-        for model in models:
-            if model['model'] == model_name:
-                return model
-        return None
+        """Get model information by name, with or without a provider prefix."""
+        cache = self._get_models_cache()
+        if not cache:
+            return None
+        model = cache[2].get(model_name)
+        if model is None:
+            model = cache[2].get(_strip_model_prefix(model_name))
+        return model
 
     def get_default_model(self) -> Optional[str]:
-        """Get the default model name."""
-        # First try to get the configured default model if it exists
-        if self.get_model_by_name(self.default_model):
-            return self.default_model
-        # Otherwise return the first available model
-        return self.get_first_available_model()
+        """Get the default model name, resolving it only once."""
+        if self._resolved_default is not None:
+            return self._resolved_default
+
+        cache = self._get_models_cache()
+        if not cache or not cache[1]:
+            return None
+        # First try to get the configured default model if it exists,
+        # otherwise use the first available model
+        if self.default_model in cache[2]:
+            self._resolved_default = self.default_model
+        else:
+            self._resolved_default = cache[1][0]['model']
+        return self._resolved_default
 
     def is_available(self) -> bool:
         """Check if Ollama service is available."""
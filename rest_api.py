@@ -12,52 +12,107 @@ REST API module for AutoYou AI Agent.
 
 This module provides REST API endpoints that allow external chat applications
 to interact with the ADK agent by sending full request messages and receiving
-full response messages.
+full response messages, or the response streamed as server-sent events.
 """
 
 import asyncio
+import itertools
+import json
 import logging
+import time
 import uuid
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from agent import root_agent
 from session_utils import SessionManager, SessionMetrics
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ADK is imported once here; without it the API answers in fallback mode.
+# The agent itself is only imported by initialize_adk().
+try:
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    from google.adk.runners import Runner
+    from google.adk.sessions import InMemorySessionService
+    from google.genai import types
+    _ADK_IMPORT_ERROR = None
+    # Run config for /api/chat/stream: model turns arrive as partial events
+    _SSE_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+except ImportError as e:
+    _ADK_IMPORT_ERROR = e
+    _SSE_RUN_CONFIG = None
+
 # Initialize session manager and metrics
 session_manager = SessionManager()
 session_metrics = SessionMetrics()
 
+# Message IDs: a random per-process prefix plus a counter, unique without
+# reading the OS random source for every message
+_MESSAGE_ID_PREFIX = uuid.uuid4().hex
+_message_counter = itertools.count(1)
+
+def _new_message_id() -> str:
+    """Return a unique ID for a message exchange."""
+    return f"{_MESSAGE_ID_PREFIX}-{next(_message_counter):x}"
+
 # Global ADK instances (shared across requests)
 adk_runner = None
 adk_session_service = None
+# (user_id, session_id) pairs already created in adk_session_service
+adk_sessions = set()
+# ADK is set up on the first chat request, not at import
+_adk_initialized = False
+# Whether initialization produced a runner; set together with adk_runner
+_adk_ready = False
+_adk_init_lock = asyncio.Lock()
 
 def initialize_adk():
-    """Initialize ADK components once at startup."""
-    global adk_runner, adk_session_service
+    """Initialize ADK components."""
+    global adk_runner, adk_session_service, _adk_initialized, _adk_ready
+    _adk_initialized = True
+    _adk_ready = False
+    adk_sessions.clear()
+    if _ADK_IMPORT_ERROR is not None:
+        logger.warning(f"ADK not available: {_ADK_IMPORT_ERROR}")
+        adk_runner = None
+        adk_session_service = None
+        return
     try:
-        from google.adk.runners import Runner
-        from google.adk.sessions import InMemorySessionService
         from agent import root_agent
         
+        if root_agent is None:
+            logger.warning("Root agent failed to initialize; REST API will run in fallback mode")
+            adk_runner = None
+            adk_session_service = None
+            return
+        
         # Shared session service and runner wired to it
         adk_session_service = InMemorySessionService()
         adk_runner = Runner(agent=root_agent, app_name="AutoYou_Agents", session_service=adk_session_service)
+        _adk_ready = True
         logger.info("ADK components initialized successfully")
     except ImportError as e:
         logger.warning(f"ADK not available: {e}")
         adk_runner = None
         adk_session_service = None
 
-# Initialize ADK at startup
-initialize_adk()
+async def ensure_adk():
+    """Initialize ADK components once, on first use.
+    
+    Importing the agent selects its model, which probes OLLAMA over the
+    synchronous ollama client; this runs in a worker thread so the event
+    loop keeps serving other requests meanwhile.
+    """
+    if _adk_initialized:
+        return
+    async with _adk_init_lock:
+        if not _adk_initialized:
+            await asyncio.to_thread(initialize_adk)
 
 class ChatRequest(BaseModel):
     """Request model for chat API."""
@@ -91,6 +146,174 @@ class APIStatus(BaseModel):
     agent_name: str = Field(..., description="Agent name")
     timestamp: datetime = Field(default_factory=datetime.now, description="Status timestamp")
 
+def _prepare_chat_session(request: ChatRequest) -> Dict[str, Any]:
+    """
+    Resolve the session for a chat request and count the new message.
+    
+    Generates a session ID when the request has none and creates the session
+    on first use. This does blocking SQLite I/O; async callers run it with
+    asyncio.to_thread so the event loop is not held up.
+    
+    Returns:
+        The session data, with message_count already incremented
+    """
+    # Debug: Log the request context type and content
+    logger.info(f"Request context type: {type(request.context)}")
+    if request.context:
+        logger.info(f"First context item type: {type(request.context[0])}")
+        logger.info(f"Context content: {request.context}")
+    
+    # Generate session ID if not provided
+    if not request.session_id:
+        request.session_id = str(uuid.uuid4())
+    
+    # Create or get existing session
+    session_data = session_manager.get_user_session(request.user_id, request.session_id)
+    if not session_data:
+        # Create new session with initial context (ensure it's serializable).
+        # ChatRequest already validates the items as dicts; other objects are
+        # only converted if something bypassed that validation.
+        context_data = request.context or []
+        if not all(isinstance(item, dict) for item in context_data):
+            context_data = []
+            # Shared by every item without a timestamp of its own
+            default_timestamp = datetime.now().isoformat()
+            for item in request.context:
+                if isinstance(item, dict):
+                    context_data.append(item)
+                elif hasattr(item, 'dict'):
+                    # Convert Pydantic model to dict
+                    context_data.append(item.dict())
+                else:
+                    # Convert any other object to dict
+                    timestamp = getattr(item, 'timestamp', None)
+                    if hasattr(timestamp, 'isoformat'):
+                        timestamp = timestamp.isoformat()
+                    elif timestamp is None:
+                        timestamp = default_timestamp
+                    else:
+                        timestamp = str(timestamp)
+                    context_data.append({
+                        "role": getattr(item, 'role', 'user'),
+                        "content": getattr(item, 'content', str(item)),
+                        "timestamp": timestamp
+                    })
+        
+        initial_state = {
+            "user_id": request.user_id,
+            "created_at": datetime.now().isoformat(),
+            "context": context_data,
+            "message_count": 0
+        }
+        session_data = session_manager.create_user_session(
+            request.user_id, 
+            request.session_id, 
+            initial_state
+        )
+    
+    # Update message count in a single atomic write
+    message_count = session_manager.increment_message_count(request.user_id, request.session_id)
+    session_data["message_count"] = (
+        message_count if message_count is not None else session_data.get("message_count", 0) + 1
+    )
+    return session_data
+
+async def _run_adk_agent(request: ChatRequest, run_config=None):
+    """
+    Start the ADK agent on a chat request.
+    
+    Args:
+        request: The chat request, with its session already prepared
+        run_config: Optional ADK RunConfig (e.g. SSE streaming mode)
+        
+    Returns:
+        The async iterator of ADK events for this message
+        
+    Raises:
+        ImportError: If the ADK components are not available
+    """
+    # Use global ADK instances
+    if not _adk_initialized:
+        await ensure_adk()
+    if not _adk_ready:
+        raise ImportError("ADK components not initialized")
+    
+    # Use the provided session_id or create a new one
+    adk_session_id = request.session_id or f"session_{request.user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    
+    # Ensure the session exists in the shared ADK session service.
+    # create_session replaces an existing session, so only call it the
+    # first time a session is seen to keep its conversation history.
+    adk_session_key = (request.user_id, adk_session_id)
+    if adk_session_key not in adk_sessions:
+        await adk_session_service.create_session(
+            app_name="AutoYou_Agents",
+            user_id=request.user_id,
+            session_id=adk_session_id
+        )
+        adk_sessions.add(adk_session_key)
+        logger.info(f"Created ADK session: {adk_session_id}")
+    
+    # Build message content with context
+    message_content = request.message
+    if request.context:
+        context_text = "\n".join(
+            f"{msg.get('role', 'user')}: {msg.get('content', '')}"
+            for msg in request.context[-5:]  # Last 5 messages for context
+        )
+        message_content = f"Previous conversation:\n{context_text}\n\nCurrent message: {request.message}"
+    
+    # Create proper Content object with role and parts
+    new_message = types.Content(
+        role="user",
+        parts=[types.Part(text=message_content)]
+    )
+    
+    return adk_runner.run_async(
+        user_id=request.user_id,
+        session_id=adk_session_id,
+        new_message=new_message,
+        run_config=run_config
+    )
+
+def _event_text_parts(chunk) -> List[str]:
+    """Extract the response text pieces from one ADK event."""
+    # One getattr per attribute instead of hasattr plus a second lookup
+    content = getattr(chunk, 'content', None)
+    if content:
+        parts = getattr(content, 'parts', None)
+        if parts:
+            return [part.text for part in parts if getattr(part, 'text', None)]
+        return [str(content)]
+    text = getattr(chunk, 'text', None)
+    return [text if text is not None else str(chunk)]
+
+def _fallback_response(request: ChatRequest, error: Exception) -> str:
+    """Log an agent failure and return the reply sent in place of the agent's."""
+    if isinstance(error, ImportError):
+        logger.warning(f"ADK import failed, using fallback: {error}")
+        # Fallback response when ADK is not available
+        return f"Hello! I received your message: '{request.message}'. I'm currently running in fallback mode. How can I help you today?"
+    
+    logger.error(f"Error running ADK agent: {error}")
+    # Fallback response for any other errors
+    return f"I apologize, but I encountered an issue processing your request. However, I received your message: '{request.message}'. Please try again or rephrase your question."
+
+def _response_metadata(request: ChatRequest, session_data: Dict[str, Any], start_ns: int) -> Dict[str, Any]:
+    """Build the metadata returned with a chat response.
+    
+    Args:
+        start_ns: time.monotonic_ns() taken when the request arrived
+    """
+    # Monotonic clock: cheaper than datetime.now() and unaffected by clock changes
+    processing_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+    return {
+        "session_message_count": session_data.get("message_count", 1),
+        "processing_time_ms": processing_time_ms,
+        "agent_version": "1.0.0",
+        **(request.metadata or {})
+    }
+
 async def process_chat_message(request: ChatRequest) -> ChatResponse:
     """
     Process a chat message using the ADK agent and return the response.
@@ -102,152 +325,106 @@ async def process_chat_message(request: ChatRequest) -> ChatResponse:
         ChatResponse with the agent's reply and session information
     """
     try:
-        # Debug: Log the request context type and content
-        logger.info(f"Request context type: {type(request.context)}")
-        if request.context:
-            logger.info(f"First context item type: {type(request.context[0])}")
-            logger.info(f"Context content: {request.context}")
         # Start processing timer
-        start_time = datetime.now()
-        
-        # Generate session ID if not provided
-        if not request.session_id:
-            request.session_id = str(uuid.uuid4())
-        
-        # Create or get existing session
-        session_data = session_manager.get_user_session(request.user_id, request.session_id)
-        if not session_data:
-            # Create new session with initial context (ensure it's serializable)
-            context_data = []
-            if request.context:
-                for item in request.context:
-                    if isinstance(item, dict):
-                        context_data.append(item)
-                    elif hasattr(item, 'dict'):
-                        # Convert Pydantic model to dict
-                        context_data.append(item.dict())
-                    else:
-                        # Convert any other object to dict
-                        context_data.append({
-                            "role": getattr(item, 'role', 'user'),
-                            "content": getattr(item, 'content', str(item)),
-                            "timestamp": getattr(item, 'timestamp', datetime.now()).isoformat() if hasattr(getattr(item, 'timestamp', None), 'isoformat') else str(getattr(item, 'timestamp', datetime.now()))
-                        })
-            
-            initial_state = {
-                "user_id": request.user_id,
-                "created_at": datetime.now().isoformat(),
-                "context": context_data,
-                "message_count": 0
-            }
-            session_data = session_manager.create_user_session(
-                request.user_id, 
-                request.session_id, 
-                initial_state
-            )
-        
-        # Update message count
-        current_count = session_data.get("message_count", 0)
-        session_data["message_count"] = current_count + 1
-        # Persist updated message_count
-        session_manager.update_user_session(request.user_id, request.session_id, {"message_count": session_data["message_count"]})
+        start_ns = time.monotonic_ns()
+        # All session store I/O for the request in one worker thread hop
+        session_data = await asyncio.to_thread(_prepare_chat_session, request)
         
         # Try to use ADK agent for processing
         try:
-            from google.genai import types
-            
-            # Use global ADK instances
-            if adk_runner is None or adk_session_service is None:
-                raise ImportError("ADK components not initialized")
-            
-            # Use the provided session_id or create a new one
-            adk_session_id = request.session_id or f"session_{request.user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            # Ensure the session exists in the shared ADK session service
-            await adk_session_service.create_session(
-                app_name="AutoYou_Agents",
-                user_id=request.user_id,
-                session_id=adk_session_id
-            )
-            logger.info(f"Ensured ADK session exists: {adk_session_id}")
-            
-            # Build message content with context
-            message_content = request.message
-            if request.context:
-                context_text = "Previous conversation:\n"
-                for msg in request.context[-5:]:  # Last 5 messages for context
-                    role = msg.get("role", "user")
-                    content = msg.get("content", "")
-                    context_text += f"{role}: {content}\n"
-                context_text += f"\nCurrent message: {request.message}"
-                message_content = context_text
-            
-            # Create proper Content object with role and parts
-            new_message = types.Content(
-                role="user",
-                parts=[types.Part(text=message_content)]
-            )
-            
             # Run the agent and collect response
             response_parts = []
-            async for chunk in adk_runner.run_async(
-                user_id=request.user_id,
-                session_id=adk_session_id,
-                new_message=new_message
-            ):
-                if hasattr(chunk, 'content') and chunk.content:
-                    if hasattr(chunk.content, 'parts') and chunk.content.parts:
-                        for part in chunk.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                response_parts.append(part.text)
-                    else:
-                        response_parts.append(str(chunk.content))
-                elif hasattr(chunk, 'text'):
-                    response_parts.append(chunk.text)
-                else:
-                    response_parts.append(str(chunk))
+            async for chunk in await _run_adk_agent(request):
+                response_parts.extend(_event_text_parts(chunk))
             
             agent_response = "".join(response_parts) if response_parts else "I'm here to help! How can I assist you today?"
             
-        except ImportError as e:
-            logger.warning(f"ADK import failed, using fallback: {e}")
-            # Fallback response when ADK is not available
-            agent_response = f"Hello! I received your message: '{request.message}'. I'm currently running in fallback mode. How can I help you today?"
-            
         except Exception as e:
-            logger.error(f"Error running ADK agent: {e}")
-            # Fallback response for any other errors
-            agent_response = f"I apologize, but I encountered an issue processing your request. However, I received your message: '{request.message}'. Please try again or rephrase your question."
+            agent_response = _fallback_response(request, e)
         
         # Generate response
-        message_id = str(uuid.uuid4())
+        message_id = _new_message_id()
         
         # Update session metrics
         session_metrics.record_message(request.user_id, request.session_id)
         
-        # Prepare response metadata
-        end_time = datetime.now()
-        processing_time_ms = max(0, int((end_time - start_time).total_seconds() * 1000))
-        response_metadata = {
-            "session_message_count": session_data.get("message_count", 1),
-            "processing_time_ms": processing_time_ms,
-            "agent_version": "1.0.0",
-            **(request.metadata or {})
-        }
-        
-        return ChatResponse(
+        # Fields are built internally, so skip re-validating them
+        return ChatResponse.model_construct(
             response=agent_response,
             message_id=message_id,
             session_id=request.session_id,
             agent_name="AutoYou AI Agent",
             timestamp=datetime.now(),
-            metadata=response_metadata
+            metadata=_response_metadata(request, session_data, start_ns)
         )
         
     except Exception as e:
         logger.error(f"Error processing chat message: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to process chat message: {str(e)}")
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_chat_message(request: ChatRequest) -> StreamingResponse:
+    """
+    Process a chat message using the ADK agent and stream the reply as it is generated.
+    
+    The response is a text/event-stream. Each "message" event carries a
+    {"text": ...} fragment of the reply, in order; a final "done" event
+    carries the same fields as ChatResponse except the response text.
+    
+    Args:
+        request: The chat request containing message and metadata
+        
+    Returns:
+        StreamingResponse of server-sent events
+    """
+    try:
+        # Start processing timer
+        start_ns = time.monotonic_ns()
+        # All session store I/O for the request in one worker thread hop
+        session_data = await asyncio.to_thread(_prepare_chat_session, request)
+    except Exception as e:
+        logger.error(f"Error processing chat message: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to process chat message: {str(e)}")
+    
+    async def event_stream():
+        try:
+            sent_text = False
+            try:
+                # In SSE mode each model turn arrives as partial events followed
+                # by one final event repeating the whole turn
+                turn_streamed = False
+                async for chunk in await _run_adk_agent(request, _SSE_RUN_CONFIG):
+                    if getattr(chunk, 'partial', False):
+                        turn_streamed = True
+                    elif turn_streamed:
+                        turn_streamed = False
+                        continue
+                    for text in _event_text_parts(chunk):
+                        sent_text = True
+                        yield _sse_event("message", {"text": text})
+                
+                if not sent_text:
+                    yield _sse_event("message", {"text": "I'm here to help! How can I assist you today?"})
+                
+            except Exception as e:
+                yield _sse_event("message", {"text": _fallback_response(request, e)})
+            
+            yield _sse_event("done", {
+                "message_id": _new_message_id(),
+                "session_id": request.session_id,
+                "agent_name": "AutoYou AI Agent",
+                "timestamp": datetime.now().isoformat(),
+                "metadata": _response_metadata(request, session_data, start_ns)
+            })
+        finally:
+            # Update session metrics once the stream ends, even if the client disconnected
+            session_metrics.record_message(request.user_id, request.session_id)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 async def get_session_info(user_id: str, session_id: str) -> SessionInfo:
     """
     Get information about a specific session.
@@ -260,16 +437,21 @@ async def get_session_info(user_id: str, session_id: str) -> SessionInfo:
         SessionInfo with session details
     """
     try:
-        session_data = session_manager.get_user_session(user_id, session_id)
+        session_data = await asyncio.to_thread(session_manager.get_user_session, user_id, session_id)
         
         if not session_data:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        return SessionInfo(
+        # Built from stored session data, so skip re-validating it; the
+        # timestamps are stored as ISO strings and parsed here instead
+        now = datetime.now()
+        created_at = session_data.get("created_at")
+        last_activity = session_data.get("last_activity")
+        return SessionInfo.model_construct(
             session_id=session_id,
             user_id=user_id,
-            created_at=session_data.get("created_at", datetime.now().isoformat()),
-            last_activity=session_data.get("last_activity", datetime.now().isoformat()),
+            created_at=datetime.fromisoformat(created_at) if created_at else now,
+            last_activity=datetime.fromisoformat(last_activity) if last_activity else now,
             message_count=session_data.get("message_count", 0)
         )
         
@@ -288,9 +470,9 @@ async def get_api_status() -> APIStatus:
     """
     try:
         # Get basic session statistics
-        stats = session_metrics.get_basic_stats()
+        stats = await asyncio.to_thread(session_metrics.get_basic_stats)
         
-        return APIStatus(
+        return APIStatus.model_construct(
             status="healthy",
             agent_name="AutoYou AI Agent",
             version="1.0.0",
@@ -302,7 +484,7 @@ async def get_api_status() -> APIStatus:
         
     except Exception as e:
         logger.error(f"Error getting API status: {e}")
-        return APIStatus(
+        return APIStatus.model_construct(
             status="error",
             agent_name="AutoYou AI Agent", 
             version="1.0.0",
@@ -15,13 +15,18 @@ including health checks, agent information, and notes statistics endpoints.
 """
 
 import argparse
+import logging
 import os
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from google.adk.cli.fast_api import get_fast_api_app
 
+# Configure logging once for the application; library modules only create loggers
+logging.basicConfig(level=logging.INFO)
+
 # Load environment variables
 load_dotenv()
 
@@ -63,21 +68,28 @@ app: FastAPI = get_fast_api_app(
     web=True,  # Enable the ADK Web UI
 )
 
+# Encode the REST API responses with orjson when it is installed
+try:
+    import orjson  # noqa: F401  # pylint: disable=unused-import
+    from fastapi.responses import ORJSONResponse as APIResponse
+except ImportError:
+    APIResponse = JSONResponse
+
 # Import REST API components
 from rest_api import (
     ChatRequest, ChatResponse, SessionInfo, APIStatus,
-    process_chat_message, get_session_info, get_api_status
+    process_chat_message, stream_chat_message, get_session_info, get_api_status
 )
 
 # Add custom health check endpoint
-@app.get("/health")
+@app.get("/health", response_class=APIResponse)
 async def health_check():
     """Health check endpoint for monitoring."""
     return {"status": "healthy", "service": "AutoYou AI Agent"}
 
 # REST API Endpoints for external chat applications
 
-@app.post("/api/chat", response_model=ChatResponse)
+@app.post("/api/chat", response_model=ChatResponse, response_class=APIResponse)
 async def chat_endpoint(chat_request: ChatRequest):
     """
     Main chat endpoint for external applications.
@@ -87,65 +99,94 @@ async def chat_endpoint(chat_request: ChatRequest):
     """
     return await process_chat_message(chat_request)
 
-@app.get("/api/sessions/{user_id}/{session_id}", response_model=SessionInfo)
+@app.post("/api/chat/stream")
+async def chat_stream_endpoint(chat_request: ChatRequest):
+    """
+    Streaming chat endpoint for external applications.
+    
+    Same request as /api/chat; the reply is sent as server-sent events while
+    the agent generates it, followed by a final "done" event.
+    """
+    return await stream_chat_message(chat_request)
+
+@app.get("/api/sessions/{user_id}/{session_id}", response_model=SessionInfo, response_class=APIResponse)
 async def get_session_endpoint(user_id: str, session_id: str):
     """
     Get information about a specific session.
     """
     return await get_session_info(user_id, session_id)
 
-@app.get("/api/status", response_model=APIStatus)
+@app.get("/api/status", response_model=APIStatus, response_class=APIResponse)
 async def api_status_endpoint():
     """
     Get the current API status and agent information.
     """
     return await get_api_status()
 
-@app.get("/api/docs")
+# Static API documentation, encoded once at import time
+API_DOCUMENTATION = {
+    "title": "AutoYou AI Agent REST API",
+    "version": "1.0.0",
+    "description": "REST API for interacting with AutoYou AI Agent",
+    "endpoints": {
+        "/api/chat": {
+            "method": "POST",
+            "description": "Send a message to the agent and receive a response",
+            "example_request": {
+                "message": "Hello, how can you help me?",
+                "session_id": "optional-session-id",
+                "user_id": "user123",
+                "context": [],
+                "metadata": {}
+            },
+            "example_response": {
+                "response": "Hello! I'm AutoYou, your AI assistant...",
+                "session_id": "generated-or-provided-session-id",
+                "message_id": "unique-message-id",
+                "timestamp": "2025-01-27T10:30:00Z",
+                "agent_name": "AutoYou AI Agent",
+                "metadata": {}
+            }
+        },
+        "/api/chat/stream": {
+            "method": "POST",
+            "description": "Send a message to the agent and receive the response as server-sent events",
+            "example_request": {
+                "message": "Hello, how can you help me?",
+                "session_id": "optional-session-id",
+                "user_id": "user123"
+            },
+            "example_response": (
+                'event: message\ndata: {"text": "Hello! I\'m AutoYou, "}\n\n'
+                'event: message\ndata: {"text": "your AI assistant..."}\n\n'
+                'event: done\ndata: {"session_id": "...", "message_id": "...", ...}\n\n'
+            )
+        },
+        "/api/sessions/{user_id}/{session_id}": {
+            "method": "GET",
+            "description": "Get information about a specific session"
+        },
+        "/api/status": {
+            "method": "GET", 
+            "description": "Get API status and agent information"
+        }
+    },
+    "usage_notes": [
+        "All endpoints return JSON responses",
+        "Session IDs are automatically generated if not provided",
+        "Context is maintained automatically within sessions",
+        "The agent supports multi-agent routing for specialized tasks"
+    ]
+}
+_API_DOCS_BODY = APIResponse(content=API_DOCUMENTATION).body
+_API_DOCS_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+@app.get("/api/docs", response_class=APIResponse)
 async def api_documentation():
     """
     API documentation endpoint with usage examples.
     """
-    return {
-        "title": "AutoYou AI Agent REST API",
-        "version": "1.0.0",
-        "description": "REST API for interacting with AutoYou AI Agent",
-        "endpoints": {
-            "/api/chat": {
-                "method": "POST",
-                "description": "Send a message to the agent and receive a response",
-                "example_request": {
-                    "message": "Hello, how can you help me?",
-                    "session_id": "optional-session-id",
-                    "user_id": "user123",
-                    "context": [],
-                    "metadata": {}
-                },
-                "example_response": {
-                    "response": "Hello! I'm AutoYou, your AI assistant...",
-                    "session_id": "generated-or-provided-session-id",
-                    "message_id": "unique-message-id",
-                    "timestamp": "2025-01-27T10:30:00Z",
-                    "agent_name": "AutoYou AI Agent",
-                    "metadata": {}
-                }
-            },
-            "/api/sessions/{user_id}/{session_id}": {
-                "method": "GET",
-                "description": "Get information about a specific session"
-            },
-            "/api/status": {
-                "method": "GET", 
-                "description": "Get API status and agent information"
-            }
-        },
-        "usage_notes": [
-            "All endpoints return JSON responses",
-            "Session IDs are automatically generated if not provided",
-            "Context is maintained automatically within sessions",
-            "The agent supports multi-agent routing for specialized tasks"
-        ]
-    }
+    return Response(content=_API_DOCS_BODY, media_type="application/json", headers=_API_DOCS_HEADERS)
 
 if __name__ == "__main__":
     # Parse command line arguments
@@ -154,15 +195,32 @@ if __name__ == "__main__":
                         help="Port to run the server on (default: 8001)")
     parser.add_argument("--host", type=str, default="0.0.0.0",
                         help="Host to bind the server to (default: 0.0.0.0)")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "1")),
+                        help="Number of worker processes (default: WEB_CONCURRENCY or 1)")
     args = parser.parse_args()
 
     print("Starting AutoYou AI Agent FastAPI server...")
     print(f"Agent directory: {AGENT_DIR}")
     print(f"Access the web UI at: http://localhost:{args.port}/dev-ui/?app={AGENT_NAME}")
 
-    uvicorn.run(
-        app,
-        host=args.host,
-        port=args.port,
-        reload=False
-    )
+    if args.workers > 1:
+        # Each worker imports the app by name in its own process. The session
+        # database is shared, but agent conversation history is kept in
+        # memory per worker. The in-process session cache would serve data
+        # another worker has since changed, so the workers run without it.
+        os.environ["SESSION_CACHE_SIZE"] = "0"
+        uvicorn.run(
+            "server:app",
+            app_dir=AGENT_DIR,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            reload=False
+        )
+    else:
+        uvicorn.run(
+            app,
+            host=args.host,
+            port=args.port,
+            reload=False
+        )
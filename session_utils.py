@@ -16,36 +16,178 @@ session creation, retrieval, and metrics tracking.
 import os
 import json
 import logging
+import queue
 import sqlite3
+import itertools
 import threading
 import uuid
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Any
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+def _default_db_path() -> str:
+    """Return the session database path, read when a manager is created."""
+    return os.getenv("SESSION_DB_PATH") or os.path.join(os.path.dirname(__file__), "sessions.db")
+
+# Session data is stored as JSON text. Use orjson when it is installed; values
+# it cannot encode (e.g. non-string keys) go through the stdlib encoder.
+try:
+    import orjson
+
+    def _dump_json(value) -> str:
+        try:
+            return orjson.dumps(value).decode()
+        except TypeError:
+            return json.dumps(value)
+
+    _load_json = orjson.loads
+except ImportError:
+    _dump_json = json.dumps
+    _load_json = json.loads
+
 class SessionManager:
     """
     Manages user sessions with SQLite storage.
     """
     
-    def __init__(self, db_path: str = os.path.join(os.path.dirname(__file__), "sessions.db")):
+    DB_TIMEOUT = 30.0  # Also the busy timeout while another connection writes
+    DB_CACHE_SIZE_KIB = 65536  # Page cache size per connection
+    DB_MMAP_SIZE = 268435456  # 256 MiB of memory-mapped reads
+    POOL_SIZE = 4  # Idle connections kept open for reuse
+    LOCK_SHARDS = 64  # Writer locks, picked by user_id (a power of two)
+    # Recently used sessions kept in memory (0 disables the cache). The cache
+    # is per process, so it must be disabled when several processes share
+    # the database; server.py does this for --workers above 1.
+    SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "1024"))
+    
+    # Fixed SQL statements. Sending the same text on every call lets sqlite3's
+    # per-connection statement cache reuse the compiled statement.
+    _INSERT_SESSION_SQL = """
+        INSERT OR REPLACE INTO sessions (id, user_id, session_id, data, updated_at)
+        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+    """
+    _SELECT_SESSION_SQL = "SELECT data FROM sessions WHERE user_id = ? AND session_id = ?"
+    _UPDATE_SESSION_SQL = (
+        "UPDATE sessions SET data = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ? AND session_id = ?"
+    )
+    # Update last activity inside SQLite instead of rewriting the JSON from
+    # Python, so concurrent writes to other fields are not lost
+    _TOUCH_SESSION_SQL = """
+        UPDATE sessions
+        SET data = json_set(data, '$.last_activity', ?), updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = ? AND session_id = ?
+    """
+    _TOUCH_SESSION_RETURNING_SQL = _TOUCH_SESSION_SQL + "RETURNING data"
+    _INCREMENT_MESSAGE_COUNT_SQL = """
+        UPDATE sessions
+        SET data = json_set(
+                data,
+                '$.message_count', COALESCE(json_extract(data, '$.message_count'), 0) + 1,
+                '$.last_activity', ?
+            ),
+            updated_at = CURRENT_TIMESTAMP
+        WHERE user_id = ? AND session_id = ?
+        RETURNING json_extract(data, '$.message_count')
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
         """
         Initialize the session manager.
         
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file; defaults to
+                SESSION_DB_PATH, or sessions.db next to this module
         """
-        self.db_path = db_path
-        self._lock = threading.Lock()
+        self.db_path = db_path or _default_db_path()
+        # Writes to one user's sessions are serialized; different users do
+        # not wait on each other
+        self._locks = [threading.Lock() for _ in range(self.LOCK_SHARDS)]
+        # Long-lived connections, so requests reuse a warm page cache instead
+        # of opening the database file each time
+        self._pool = queue.SimpleQueue()
+        # Write-through LRU of session data keyed by (user_id, session_id);
+        # SQLite stays the durable copy
+        self._cache_lock = threading.Lock()
+        self._session_cache = OrderedDict()
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection for the pool."""
+        # Pooled connections may be handed to different threads over their life
+        conn = sqlite3.connect(self.db_path, timeout=self.DB_TIMEOUT, check_same_thread=False)
+        # Per-connection settings; journal_mode=WAL is stored in the database file
+        conn.execute("PRAGMA synchronous = NORMAL")  # With WAL, fsync only at checkpoints
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute(f"PRAGMA cache_size = -{self.DB_CACHE_SIZE_KIB}")  # Negative value is in KiB
+        conn.execute(f"PRAGMA mmap_size = {self.DB_MMAP_SIZE}")
+        return conn
+    
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection, committing on success and rolling back on error."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            with conn:
+                yield conn
+        finally:
+            if self._pool.qsize() < self.POOL_SIZE:
+                self._pool.put(conn)
+            else:
+                conn.close()
+    
+    def _lock_for(self, user_id: str) -> threading.Lock:
+        """Return the writer lock for a user's sessions."""
+        return self._locks[hash(user_id) & (self.LOCK_SHARDS - 1)]
+    
+    def _cache_get(self, key) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached session, or None on a miss."""
+        with self._cache_lock:
+            session_data = self._session_cache.get(key)
+            if session_data is None:
+                return None
+            self._session_cache.move_to_end(key)
+            return dict(session_data)
+    
+    def _cache_put(self, key, session_data: Dict[str, Any]):
+        """Store a copy of the latest session data."""
+        if self.SESSION_CACHE_SIZE <= 0:
+            return
+        with self._cache_lock:
+            self._session_cache[key] = dict(session_data)
+            self._session_cache.move_to_end(key)
+            if len(self._session_cache) > self.SESSION_CACHE_SIZE:
+                self._session_cache.popitem(last=False)
+    
+    def _cache_update(self, key, updates: Dict[str, Any]):
+        """Apply field updates to a cached session, if it is cached."""
+        with self._cache_lock:
+            session_data = self._session_cache.get(key)
+            if session_data is not None:
+                session_data.update(updates)
+    
+    def close(self):
+        """Close the pooled connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+    
     def _init_database(self):
         """Initialize the SQLite database with required tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
+                # WAL lets session reads run while another connection commits
+                conn.execute("PRAGMA journal_mode = WAL")
                 conn.execute("""
                     CREATE TABLE IF NOT EXISTS sessions (
                         id TEXT PRIMARY KEY,
@@ -88,28 +230,26 @@ class SessionManager:
             The created session data
         """
         try:
-            with self._lock:
+            now = datetime.now().isoformat()
+            with self._lock_for(user_id):
                 session_data = {
                     **initial_state,
                     "user_id": user_id,
                     "session_id": session_id,
-                    "created_at": datetime.now().isoformat(),
-                    "last_activity": datetime.now().isoformat()
+                    "created_at": now,
+                    "last_activity": now
                 }
                 
-                with sqlite3.connect(self.db_path) as conn:
-                    conn.execute("""
-                        INSERT OR REPLACE INTO sessions 
-                        (id, user_id, session_id, data, updated_at)
-                        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    """, (
+                with self._connection() as conn:
+                    conn.execute(self._INSERT_SESSION_SQL, (
                         f"{user_id}:{session_id}",
                         user_id,
                         session_id,
-                        json.dumps(session_data)
+                        _dump_json(session_data)
                     ))
                     conn.commit()
                 
+                self._cache_put((user_id, session_id), session_data)
                 logger.info(f"Created session {session_id} for user {user_id}")
                 return session_data
                 
@@ -129,29 +269,29 @@ class SessionManager:
             Session data if found, None otherwise
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.execute("""
-                    SELECT data FROM sessions 
-                    WHERE user_id = ? AND session_id = ?
-                """, (user_id, session_id))
-                
-                row = cursor.fetchone()
-                if row:
-                    session_data = json.loads(row[0])
-                    # Update last activity
-                    session_data["last_activity"] = datetime.now().isoformat()
-                    
-                    # Update in database
-                    conn.execute("""
-                        UPDATE sessions 
-                        SET data = ?, updated_at = CURRENT_TIMESTAMP
-                        WHERE user_id = ? AND session_id = ?
-                    """, (json.dumps(session_data), user_id, session_id))
-                    conn.commit()
-                    
-                    return session_data
-                
-                return None
+            key = (user_id, session_id)
+            now = datetime.now().isoformat()
+            with self._connection() as conn:
+                # Hot sessions are served from memory; a miss reads the row
+                # back from the same UPDATE
+                session_data = self._cache_get(key)
+                if session_data is None:
+                    # Fill the cache under the writer lock, so a concurrent
+                    # increment_message_count cannot commit between the read
+                    # and the put and leave an older count cached
+                    with self._lock_for(user_id):
+                        row = conn.execute(self._TOUCH_SESSION_RETURNING_SQL, (now, user_id, session_id)).fetchone()
+                        if not row:
+                            return None
+                        conn.commit()
+                        session_data = _load_json(row[0])
+                        self._cache_put(key, session_data)
+                else:
+                    conn.execute(self._TOUCH_SESSION_SQL, (now, user_id, session_id))
+                    session_data["last_activity"] = now
+                    self._cache_update(key, {"last_activity": now})
+                conn.commit()
+                return session_data
                 
         except Exception as e:
             logger.error(f"Failed to get session: {e}")
@@ -170,48 +310,88 @@ class SessionManager:
             The updated session data if successful, None otherwise
         """
         try:
-            with self._lock:
-                with sqlite3.connect(self.db_path) as conn:
-                    cursor = conn.execute(
-                        "SELECT data FROM sessions WHERE user_id = ? AND session_id = ?",
-                        (user_id, session_id)
-                    )
-                    row = cursor.fetchone()
+            now = datetime.now().isoformat()
+            with self._lock_for(user_id):
+                with self._connection() as conn:
+                    row = conn.execute(self._SELECT_SESSION_SQL, (user_id, session_id)).fetchone()
                     if not row:
                         return None
-                    session_data = json.loads(row[0])
+                    session_data = _load_json(row[0])
                     # Merge updates
                     if updates:
                         session_data.update(updates)
                     # Always refresh last activity
-                    session_data["last_activity"] = datetime.now().isoformat()
+                    session_data["last_activity"] = now
                     
-                    conn.execute(
-                        "UPDATE sessions SET data = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ? AND session_id = ?",
-                        (json.dumps(session_data), user_id, session_id)
-                    )
+                    conn.execute(self._UPDATE_SESSION_SQL, (_dump_json(session_data), user_id, session_id))
                     conn.commit()
+                    self._cache_put((user_id, session_id), session_data)
                     return session_data
         except Exception as e:
             logger.error(f"Failed to update session: {e}")
             return None
 
+    def increment_message_count(self, user_id: str, session_id: str) -> Optional[int]:
+        """
+        Atomically increment a session's message count and refresh its last activity.
+        
+        The stored JSON is updated in place by SQLite, without reading and
+        rewriting the session data in Python.
+        
+        Args:
+            user_id: The user identifier
+            session_id: The session identifier
+        
+        Returns:
+            The new message count if the session exists, None otherwise
+        """
+        try:
+            now = datetime.now().isoformat()
+            with self._lock_for(user_id):
+                with self._connection() as conn:
+                    row = conn.execute(self._INCREMENT_MESSAGE_COUNT_SQL, (now, user_id, session_id)).fetchone()
+                    conn.commit()
+                    if not row:
+                        return None
+                    self._cache_update((user_id, session_id), {"message_count": row[0], "last_activity": now})
+                    return row[0]
+        except Exception as e:
+            logger.error(f"Failed to increment session message count: {e}")
+            return None
+
 
 class SessionMetrics:
     """
     Tracks session metrics and statistics.
     """
     
-    def __init__(self, db_path: str = os.path.join(os.path.dirname(__file__), "sessions.db")):
+    # Total and active (updated in the last hour) sessions in one pass.
+    # updated_at holds CURRENT_TIMESTAMP values (UTC, "YYYY-MM-DD HH:MM:SS"),
+    # so the cutoff is computed by SQLite in the same format.
+    _SESSION_COUNTS_SQL = """
+        SELECT COUNT(*), COALESCE(SUM(updated_at > datetime('now', ?1)), 0)
+        FROM sessions
+    """
+    
+    def __init__(self, db_path: Optional[str] = None):
         """
         Initialize the session metrics tracker.
         
         Args:
-            db_path: Path to the SQLite database file
+            db_path: Path to the SQLite database file; defaults to
+                SESSION_DB_PATH, or sessions.db next to this module
         """
-        self.db_path = db_path
-        self._message_counts = {}
+        self.db_path = db_path or _default_db_path()
+        # Only the total is kept; per-session counts are stored with each
+        # session by SessionManager.increment_message_count. next() on an
+        # itertools.count is atomic, so recording needs no lock. Reading the
+        # total also draws a value, so reads are counted and subtracted.
+        self._message_counter = itertools.count(1)
+        self._counter_reads = 0
         self._lock = threading.Lock()
+        # Stats connection, opened on first use and then kept for later calls
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_lock = threading.Lock()
     
     def record_message(self, user_id: str, session_id: str):
         """
@@ -222,13 +402,17 @@ class SessionMetrics:
             session_id: The session identifier
         """
         try:
-            with self._lock:
-                key = f"{user_id}:{session_id}"
-                self._message_counts[key] = self._message_counts.get(key, 0) + 1
+            next(self._message_counter)
                 
         except Exception as e:
             logger.error(f"Failed to record message metric: {e}")
     
+    def _message_total(self) -> int:
+        """Return the number of recorded messages."""
+        with self._lock:
+            self._counter_reads += 1
+            return next(self._message_counter) - self._counter_reads
+    
     def get_basic_stats(self) -> Dict[str, Any]:
         """
         Get basic session statistics.
@@ -237,21 +421,18 @@ class SessionMetrics:
             Dictionary containing basic statistics
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # Get total sessions
-                cursor = conn.execute("SELECT COUNT(*) FROM sessions")
-                total_sessions = cursor.fetchone()[0]
+            with self._conn_lock:
+                if self._conn is None:
+                    self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._conn
                 
-                # Get total messages from in-memory counter
-                total_messages = sum(self._message_counts.values())
+                # Get total and active sessions
+                total_sessions, active_sessions = conn.execute(
+                    self._SESSION_COUNTS_SQL, ("-1 hour",)
+                ).fetchone()
                 
-                # Get active sessions (updated in last hour)
-                one_hour_ago = (datetime.now() - timedelta(hours=1)).isoformat()
-                cursor = conn.execute("""
-                    SELECT COUNT(*) FROM sessions 
-                    WHERE updated_at > ?
-                """, (one_hour_ago,))
-                active_sessions = cursor.fetchone()[0]
+                # Get total messages from in-memory counter
+                total_messages = self._message_total()
                 
                 return {
                     "total_sessions": total_sessions,
@@ -17,11 +17,14 @@ for external chat applications.
 import asyncio
 import json
 import logging
+import os
+import tempfile
 from datetime import datetime
-from typing import Dict, Any
+from types import SimpleNamespace
+from typing import Dict, Any, List, Tuple
 
-import requests
-from requests.exceptions import RequestException
+import httpx
+from httpx import HTTPError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,16 +34,17 @@ logger = logging.getLogger(__name__)
 API_BASE_URL = "http://localhost:8081"
 API_ENDPOINTS = {
     "chat": f"{API_BASE_URL}/api/chat",
+    "chat_stream": f"{API_BASE_URL}/api/chat/stream",
     "status": f"{API_BASE_URL}/api/status",
     "docs": f"{API_BASE_URL}/api/docs",
     "session_info": f"{API_BASE_URL}/api/sessions"
 }
 
-def check_api_status():
+async def check_api_status(client: httpx.AsyncClient):
     """Test the API status endpoint."""
     print("\n=== Testing API Status Endpoint ===")
     try:
-        response = requests.get(API_ENDPOINTS["status"], timeout=10)
+        response = await client.get(API_ENDPOINTS["status"], timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -51,15 +55,15 @@ def check_api_status():
         
         assert data.get('status') == 'healthy'
         
-    except RequestException as e:
+    except HTTPError as e:
         logger.error(f"❌ API Status test failed: {e}")
         assert False, f"API Status test failed: {e}"
 
-def check_api_docs():
+async def check_api_docs(client: httpx.AsyncClient):
     """Test the API documentation endpoint."""
     print("\n=== Testing API Documentation Endpoint ===")
     try:
-        response = requests.get(API_ENDPOINTS["docs"], timeout=10)
+        response = await client.get(API_ENDPOINTS["docs"], timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -69,11 +73,11 @@ def check_api_docs():
         
         assert "AutoYou AI Agent REST API" in data.get('title', "")
         
-    except RequestException as e:
+    except HTTPError as e:
         logger.error(f"❌ API Docs test failed: {e}")
         assert False, f"API Docs test failed: {e}"
 
-def check_chat_endpoint_basic():
+async def check_chat_endpoint_basic(client: httpx.AsyncClient):
     """Test basic chat functionality."""
     print("\n=== Testing Basic Chat Endpoint ===")
     
@@ -84,7 +88,7 @@ def check_chat_endpoint_basic():
     }
     
     try:
-        response = requests.post(
+        response = await client.post(
             API_ENDPOINTS["chat"],
             json=chat_request,
             headers={"Content-Type": "application/json"},
@@ -99,11 +103,11 @@ def check_chat_endpoint_basic():
         assert data.get('session_id') is not None
         return data.get('session_id')
         
-    except RequestException as e:
+    except HTTPError as e:
         logger.error(f"❌ Basic chat test failed: {e}")
         assert False, f"Basic chat test failed: {e}"
 
-def check_chat_endpoint_with_session(session_id: str):
+async def check_chat_endpoint_with_session(client: httpx.AsyncClient, session_id: str):
     """Test chat with existing session."""
     print("\n=== Testing Chat with Existing Session ===")
     
@@ -115,7 +119,7 @@ def check_chat_endpoint_with_session(session_id: str):
     }
     
     try:
-        response = requests.post(
+        response = await client.post(
             API_ENDPOINTS["chat"],
             json=chat_request,
             headers={"Content-Type": "application/json"},
@@ -129,17 +133,17 @@ def check_chat_endpoint_with_session(session_id: str):
         
         assert data.get('session_id') == session_id
         
-    except RequestException as e:
+    except HTTPError as e:
         logger.error(f"❌ Session continuity test failed: {e}")
         assert False, f"Session continuity test failed: {e}"
 
-def check_session_info_endpoint(user_id: str, session_id: str):
+async def check_session_info_endpoint(client: httpx.AsyncClient, user_id: str, session_id: str):
     """Test session information endpoint."""
     print("\n=== Testing Session Info Endpoint ===")
     
     try:
         url = f"{API_ENDPOINTS['session_info']}/{user_id}/{session_id}"
-        response = requests.get(url, timeout=10)
+        response = await client.get(url, timeout=10)
         response.raise_for_status()
         
         data = response.json()
@@ -150,11 +154,11 @@ def check_session_info_endpoint(user_id: str, session_id: str):
         assert data.get('session_id') == session_id
         assert data.get('user_id') == user_id
         
-    except RequestException as e:
+    except HTTPError as e:
         logger.error(f"❌ Session info test failed: {e}")
         assert False, f"Session info test failed: {e}"
 
-def check_chat_with_context():
+async def check_chat_with_context(client: httpx.AsyncClient):
     """Test chat with conversation context."""
     print("\n=== Testing Chat with Context ===")
     
@@ -179,7 +183,7 @@ def check_chat_with_context():
     }
     
     try:
-        response = requests.post(
+        response = await client.post(
             API_ENDPOINTS["chat"],
             json=chat_request,
             headers={"Content-Type": "application/json"},
@@ -194,11 +198,11 @@ def check_chat_with_context():
         # This might need to be smarter depending on the agent's response.
         assert "alice" in data.get('response', '').lower()
         
-    except RequestException as e:
+    except HTTPError as e:
         logger.error(f"❌ Context test failed: {e}")
         assert False, f"Context test failed: {e}"
 
-def check_error_handling():
+async def check_error_handling(client: httpx.AsyncClient):
     """Test error handling with invalid requests."""
     print("\n=== Testing Error Handling ===")
     
@@ -208,7 +212,7 @@ def check_error_handling():
     }
     
     try:
-        response = requests.post(
+        response = await client.post(
             API_ENDPOINTS["chat"],
             json=invalid_request,
             headers={"Content-Type": "application/json"},
@@ -218,25 +222,155 @@ def check_error_handling():
         assert response.status_code == 422, f"Expected status code 422, but got {response.status_code}"
         print("✅ Validation error handled correctly")
             
-    except RequestException as e:
+    except HTTPError as e:
         logger.error(f"❌ Error handling test failed: {e}")
         assert False, f"Error handling test failed: {e}"
 
+def parse_sse_events(body: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Split a text/event-stream body into (event, data) pairs, checking the framing."""
+    assert body.endswith("\n\n"), f"Stream does not end with a blank line: {body[-40:]!r}"
+    events = []
+    for frame in body[:-2].split("\n\n"):
+        lines = frame.split("\n")
+        assert len(lines) == 2, f"Unexpected event frame: {frame!r}"
+        assert lines[0].startswith("event: ") and lines[1].startswith("data: "), f"Unexpected event frame: {frame!r}"
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+def check_sse_events(events: List[Tuple[str, Dict[str, Any]]], session_id: str) -> str:
+    """Check the message-then-done event order and return the streamed text."""
+    assert len(events) >= 2, f"Expected message and done events, got {events}"
+    assert all(name == "message" for name, _ in events[:-1]), events
+    assert all(isinstance(data.get("text"), str) for _, data in events[:-1]), events
+    done_name, done = events[-1]
+    assert done_name == "done", events
+    assert done.get("session_id") == session_id
+    assert done.get("message_id") and done.get("metadata") is not None
+    return "".join(data["text"] for _, data in events[:-1])
+
+async def check_chat_stream_endpoint(client: httpx.AsyncClient, session_id: str):
+    """Test the streaming chat endpoint's event framing."""
+    print("\n=== Testing Streaming Chat Endpoint ===")
+    
+    chat_request = {
+        "message": "Say hello in one short sentence.",
+        "session_id": session_id,
+        "user_id": "test_user_001",
+        "metadata": {"test": "streaming"}
+    }
+    
+    try:
+        async with client.stream("POST", API_ENDPOINTS["chat_stream"], json=chat_request, timeout=30) as response:
+            response.raise_for_status()
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = (await response.aread()).decode()
+        
+        text = check_sse_events(parse_sse_events(body), session_id)
+        print(f"✅ Streamed response: {text[:100]}...")
+        print("✅ Message events followed by one done event")
+        
+    except HTTPError as e:
+        logger.error(f"❌ Streaming chat test failed: {e}")
+        assert False, f"Streaming chat test failed: {e}"
+
+def test_stream_skips_aggregated_event():
+    """Test SSE framing against a fake ADK runner, without a running server."""
+    print("\n=== Testing Streaming Event Handling ===")
+    # rest_api opens its session database on import; keep it out of the repo
+    tmp = tempfile.TemporaryDirectory()
+    saved_path = os.environ.get("SESSION_DB_PATH")
+    os.environ["SESSION_DB_PATH"] = os.path.join(tmp.name, "sessions.db")
+    try:
+        import rest_api
+        from session_utils import SessionManager
+    finally:
+        if saved_path is None:
+            del os.environ["SESSION_DB_PATH"]
+        else:
+            os.environ["SESSION_DB_PATH"] = saved_path
+    
+    def event(text, partial):
+        return SimpleNamespace(partial=partial, content=SimpleNamespace(parts=[SimpleNamespace(text=text)]))
+    
+    class FakeRunner:
+        def run_async(self, **kwargs):
+            async def events():
+                # Two model turns, each streamed as partials and then repeated
+                # whole by the final event, which must not be sent again
+                for item in (event("Hel", True), event("lo", True), event("Hello", False),
+                             event(" world", True), event(" world", False)):
+                    yield item
+            return events()
+    
+    class FakeSessionService:
+        async def create_session(self, **kwargs):
+            return None
+    
+    class CountingMetrics:
+        def __init__(self):
+            self.recorded = 0
+        
+        def record_message(self, user_id, session_id):
+            self.recorded += 1
+    
+    saved = {name: getattr(rest_api, name) for name in (
+        "adk_runner", "adk_session_service", "_adk_initialized", "_adk_ready",
+        "session_manager", "session_metrics"
+    )}
+    with tmp:
+        manager = SessionManager(os.path.join(tmp.name, "test_sessions.db"))
+        metrics = CountingMetrics()
+        try:
+            rest_api.adk_runner = FakeRunner()
+            rest_api.adk_session_service = FakeSessionService()
+            rest_api._adk_initialized = True
+            rest_api._adk_ready = True
+            rest_api.session_manager = manager
+            rest_api.session_metrics = metrics
+            
+            async def stream():
+                request = rest_api.ChatRequest(message="Hi", user_id="stream_user", session_id="stream_session")
+                response = await rest_api.stream_chat_message(request)
+                assert response.media_type == "text/event-stream"
+                return "".join([chunk async for chunk in response.body_iterator])
+            
+            events = parse_sse_events(asyncio.run(stream()))
+            text = check_sse_events(events, "stream_session")
+            assert [data["text"] for _, data in events[:-1]] == ["Hel", "lo", " world"], events
+            assert text == "Hello world"
+            assert metrics.recorded == 1, metrics.recorded
+            print("✅ Partials streamed once, aggregated events skipped, message recorded once")
+        finally:
+            for name, value in saved.items():
+                setattr(rest_api, name, value)
+            rest_api.adk_sessions.discard(("stream_user", "stream_session"))
+            manager.close()
+
+async def run_all_checks():
+    """Run the independent checks concurrently, then the session checks in order."""
+    # One client for all checks, so requests reuse pooled keep-alive connections
+    async with httpx.AsyncClient(timeout=30) as client:
+        await asyncio.gather(
+            check_api_status(client),
+            check_api_docs(client),
+            check_chat_with_context(client),
+            check_error_handling(client),
+        )
+        
+        session_id = await check_chat_endpoint_basic(client)
+        
+        assert session_id is not None, "Failed to get session_id from basic chat test."
+        
+        await check_chat_endpoint_with_session(client, session_id)
+        await check_session_info_endpoint(client, "test_user_001", session_id)
+        await check_chat_stream_endpoint(client, session_id)
+
 def test_all_features():
     """Run all REST API tests."""
     print("🚀 Starting AutoYou AI Agent REST API Tests")
     print("=" * 50)
     
-    check_api_status()
-    check_api_docs()
-    session_id = check_chat_endpoint_basic()
-    
-    assert session_id is not None, "Failed to get session_id from basic chat test."
-    
-    check_chat_endpoint_with_session(session_id)
-    check_session_info_endpoint("test_user_001", session_id)
-    check_chat_with_context()
-    check_error_handling()
+    asyncio.run(run_all_checks())
     
     print("\n" + "=" * 50)
     print("🏁 Test Results Summary")
@@ -251,6 +385,7 @@ if __name__ == "__main__":
     print()
     
     try:
+        test_stream_skips_aggregated_event()
         test_all_features()
         exit(0)
     except AssertionError as e: